@@ -5,8 +5,10 @@ Author: Lim Jun Yi
 student_id: 32625510
 Date: 2023/5/26
 """
+from array import array
 from collections import deque
 from math import inf
+from random import Random
 
 
 class Network:
@@ -21,8 +23,11 @@ class Network:
         """
         This is the initialisation method for the Network class.
 
-        Approach: Find the amount of data center and create an array of its size + 1 to stores all the data centers.
-                    Then loop through all the id for the data center and add them into the network correspondingly.
+        Approach: Find the amount of data center and split every data center into three centers in the network, in(i) = 3i,
+                    mid(i) = 3i + 1 and out(i) = 3i + 2. The connection in(i) -> mid(i) can take maxIn[i] and the connection
+                    mid(i) -> out(i) can take maxOut[i], so the data coming into a center and the data leaving it are limited
+                    by the flow of a connection like every other one, and the backward connections give it back when a path
+                    undoes some flow. The sink is the last center, at 3|D|.
 
         Input:
             maxIn: A list of integers in which maxIn[i] specifies the maximum amount of incoming data that data centre i can process per second.
@@ -31,21 +36,43 @@ class Network:
             best/worst: O(|D|), where checking the length of the maxIn and looping through the id of data centers costs a complexity of O(2|D|)=O(|D|).
                         Where |D| is the numbers of data centers.
         Space complexity:
-            Aux: O(|D|), for making a network array of size |D|. Where |D| is the numbers of data centers.
+            Aux: O(|D|), for making a network array of size 3|D| + 1. Where |D| is the numbers of data centers.
         """
-        self.sink_id = len(maxIn)  # O(|D|) # find the amount of data center, will also use this as the id for the sink node
-        self.network = [None] * (self.sink_id + 1)  # make the graph, +1 for sink, +1 for source
+        self.sink_id = 3 * len(maxIn)  # O(|D|) # three centers for every data center, will also use this as the id for the sink node
+        self.network = [None] * (self.sink_id + 1)  # make the graph, +1 for sink
 
-        for i in range(self.sink_id):  # O|D|
-            self.network[i] = DataCenter(i, maxIn[i], maxOut[i])    # O(1)
+        for i in range(self.sink_id + 1):  # O|D|
+            self.network[i] = DataCenter(i)    # O(1)
 
-        self.network[self.sink_id] = DataCenter(self.sink_id)  # add sink node # O(1)
+        for i in range(len(maxIn)):  # O|D|
+            self.add_connection(3 * i, 3 * i + 1, maxIn[i])        # in(i) -> mid(i)
+            self.add_connection(3 * i + 1, 3 * i + 2, maxOut[i])   # mid(i) -> out(i)
+
+    def add_connection(self, start, end, flow):
+        """
+        This is the method for adding a connection and its backward connection into the residue network.
+
+        Input:
+            start: An int, the id of the center the connection departs from.
+            end: An int, the id of the center the connection arrives at.
+            flow: The maximum data flow of the connection.
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1)
+        """
+        forward_connection = Connection(start, end, flow)
+        backward_connection = Connection(end, start)
+        self.network[start].add_connection(forward_connection)  # adding forward
+        self.network[end].add_connection(backward_connection)   # adding backward
 
     def add_connection_prep(self, connections, target):
         """
         This is the method for adding the connections into the residue network.
 
-        Approach: Loop through every connection in connections and add them into each data center correspondingly.
+        Approach: Loop through every connection in connections and add them into each data center correspondingly, from out(a)
+                    to in(b). Then connect mid(t) of every target to the sink, so a target stores the data it has received
+                    without using its maxOut, and can still send data on to other centers.
 
         Input:
             connections: A list of tuples (a, b, t) where: a is the ID of the data centre from which the communication channel departs.
@@ -56,36 +83,29 @@ class Network:
             best/worst: O(|C| + |T|), where looping the connections and target costs O(|C| + |T|).
                             |C| is number of connection and |T| is number of target centers.
         Space complexity:
-            Aux: O(1), no additional space is needed.
+            Aux: O(|C| + |T|), for the connections.
         """
         # adding all the connections into the residue network
         for connection in connections:  # O|C|
             start = connection[0]
             end = connection[1]
             throughput = connection[2]
-
-            forward_connection = Connection(start, end, throughput)
-            backward_connection = Connection(end, start)
-            self.network[start].add_connection(forward_connection)  # adding forward
-            self.network[end].add_connection(backward_connection)   # adding backward
+            self.add_connection(3 * start + 2, 3 * end, throughput)   # out(start) -> in(end)
 
         # connect all the targets to a single sink
         for t in target:  # O|T|
-            to_sink = Connection(t, self.sink_id, inf)
-            from_sink = Connection(self.sink_id, t)
-            self.network[t].add_connection(to_sink)
-            self.network[self.sink_id].add_connection(from_sink)
+            self.add_connection(3 * t + 1, self.sink_id, inf)     # mid(t) -> sink
 
-    def bfs(self, parent_array, origin):
+    def bfs(self, parent_array, source):
         """
-        This is the method for find available path from origin to the sink.
+        This is the method for find available path from source to the sink.
 
         Approach: by using a deque data structure, the bfs algorithm traverse into the network layer by layer and find all the unvisited centers and set their index in the
                     visited array to true. it is done by going through all the connection for each center in the deque and stop once it reaches the sink node.
 
         Input:
             parent_array: An array that stores the parents of the center, where the center is represented by the index in the array.
-            origin: The starting center id
+            source: The starting center id, mid(origin) of the origin data center.
         Return:
             True if there is a path and False otherwise.
         Time complexity:
@@ -94,17 +114,18 @@ class Network:
         Space complexity:
             Aux: O(|D|), for making the visited array and deque.
         """
-        visited = [False] * (self.sink_id + 1)  # O(|D|) # sink_id + 2 = the total amount of data centers + 2(sink and source)
+        visited = [False] * (self.sink_id + 1)  # O(|D|) # sink_id + 1 = the total amount of centers + 1(sink)
 
-        my_queue = deque([origin])
-        visited[origin] = True  # set origin as visited
+        my_queue = deque([source])
+        visited[source] = True  # set source as visited
 
         while my_queue:
             current_id = my_queue.popleft()  # O(1)
 
             for connection in self.network[current_id].connection:
-                # only go in if this the target is not visited and the target still can take in more data or source still can give out.
-                if not visited[connection.end] and connection.flow > 0 and self.network[connection.end].maxIn > 0 and self.network[connection.start].maxOut > 0:
+                # only go in if this the target is not visited and the connection can still take more data,
+                # the maxIn and maxOut of the data centers are connections too.
+                if not visited[connection.end] and connection.flow > 0:
                     visited[connection.end] = True
                     my_queue.append(connection.end)
                     parent_array[connection.end] = connection
@@ -119,12 +140,11 @@ class Network:
         This is the method for finding the maximum flow of this network.
 
         Approach: Making a parent array to store the path of the BFS traversal, this will be used to determine the smallest flow along this particular path.
-                    We will run the residue network that we had made earlier on BFS until there is no more possible path from the origin to any of the targets.
+                    We will run the residue network that we had made earlier on BFS from mid(origin) until there is no more possible path to any of the targets.
                     If there is a path in the residue network, the BFS will fill up the parent array, and we will loop through the parent array from back to front and check for the
-                    smallest flow within the path, after we got the smallest flow in this path, we will update the path from target to origin with the minimum flow.
-                    Where the MaxIn of the receiving center on that connection will be deducted by the min flow and the maxOut on the source center will also be deducted by that amount,
-                    follow by deducting the amount on the connection itself. And the opposite if done to the backward flow where we add the flow amount onto it, so it can be used later by the bfs
-                    if out current path is not optimal.
+                    smallest flow within the path, after we got the smallest flow in this path, we will update the path from sink to origin with the min flow.
+                    Where the flow on each connection is deducted by the min flow, and the opposite is done to the backward flow where we add the flow amount onto it, so it can be used
+                    later by the bfs if out current path is not optimal. As maxIn and maxOut are connections between the split centers, they are deducted and given back the same way.
 
                     The process is repeated until there is no path left on the residue network( BFS returned False ), all the min flow of the path will be added and sum to a max flow.
 
@@ -138,31 +158,23 @@ class Network:
         Space complexity:
             Aux: O(|D|), for making the parent array.
         """
-        parent_array = [-1] * (self.sink_id + 1)  # O(|D|) # sink_id + 1= the total amount of data centers + 1(sink)
+        parent_array = [-1] * (self.sink_id + 1)  # O(|D|) # sink_id + 1= the total amount of centers + 1(sink)
+        source = 3 * origin + 1     # mid(origin), so the data sent is limited by maxOut of the origin
         max_throughput = 0
 
-        while self.bfs(parent_array, origin):  # O(|D|+|C|) # while there is path in residue
-            current_id = parent_array[self.sink_id].start
+        while self.bfs(parent_array, source):  # O(|D|+|C|) # while there is path in residue
+            current_id = self.sink_id
             flow = inf
-            while current_id != origin:  # O(|D|) # to find the smallest flow along the path
+            while current_id != source:  # O(|D|) # to find the smallest flow along the path
                 parent_connection = parent_array[current_id]  # get the connection from parent to current
                 flow = min(parent_connection.flow, flow)  # find the smallest flow
-                # update the smallest flow along the path
-                # if flow > source's maxOut
-                if flow > self.network[parent_connection.start].maxOut:
-                    flow = self.network[parent_connection.start].maxOut
-                    parent_connection.flow = flow
-                # if flow > target's maxIn
-                if flow > self.network[parent_connection.end].maxIn:
-                    flow = self.network[parent_connection.end].maxIn
-                    parent_connection.flow = flow
-                current_id = parent_array[current_id].start  # update current
+                current_id = parent_connection.start  # update current
 
             # after the second while loop, the flow should be the smallest flow along the path.
             # update the residue
-            current_id = parent_array[self.sink_id].start
+            current_id = self.sink_id
 
-            while current_id != origin:  # O(|D|)
+            while current_id != source:  # O(|D|)
                 backward_connection = None
                 parent_connection = parent_array[current_id]  # get the connection from parent to current
 
@@ -171,15 +183,11 @@ class Network:
                         backward_connection = connection
                         break
 
-                # update the maxIn and maxOut and connection flow
+                # update the connection flow and the backward connection flow
                 parent_connection.flow -= flow
-                self.network[parent_connection.start].maxOut -= flow
-                self.network[parent_connection.end].maxIn -= flow
-
-                # update the backward connection flow
                 backward_connection.flow += flow
 
-                current_id = parent_array[current_id].start
+                current_id = parent_connection.start
 
             max_throughput += flow
 
@@ -257,31 +265,470 @@ class Connection:
         self.flow = flow
 
 
-def maxThroughput(connections, maxIn, maxOut, origin, targets):
+class FlowNetwork:
+    """
+    This is the class for a residual network stored in flat arrays, used by the max flow engines of maxThroughput that
+    are not ford_fulkerson.
+
+    Every edge e is kept together with its reverse edge e ^ 1 (the edge with the last bit of its index flipped), head[e]
+    is the node it goes to and capacity[e] the amount it can still take, so pushing f along e is capacity[e] -= f and
+    capacity[e ^ 1] += f, and the node an edge starts from is head[e ^ 1]. After finish, the edges leaving node v are
+    order[offsets[v]:offsets[v+1]].
+
+    Author: Lim Jun Yi
+    student_id: 32625510
+    Date: 2023/5/26
+    """
+
+    def __init__(self, amount_nodes):
+        """
+        This is the initialisation method for the FlowNetwork class.
+
+        Input:
+            amount_nodes: An int, the number of nodes.
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1), the arrays grow with add_edge.
+        """
+        self.amount_nodes = amount_nodes
+        self.head = array('i')
+        self.capacity = array('q')
+        self.offsets = None
+        self.order = None
+
+    def add_edge(self, start, end, capacity):
+        """
+        This is the method to add an edge and its reverse edge with no capacity.
+
+        Input:
+            start: An int, the node the edge leaves.
+            end: An int, the node the edge goes to.
+            capacity: An int, the capacity of the edge.
+        Time complexity:
+            best/worst: O(1), amortised.
+        Space complexity:
+            Aux: O(1)
+        """
+        self.head.append(end)
+        self.capacity.append(capacity)
+        self.head.append(start)
+        self.capacity.append(0)
+
+    def finish(self):
+        """
+        This is the method to group the edges by the node they leave, with a counting sort, once every edge is added.
+
+        Time complexity:
+            best/worst: O(|V| + |E|), where |V| is the number of nodes and |E| the number of edges.
+        Space complexity:
+            Aux: O(|V| + |E|)
+        """
+        head = self.head
+        offsets = array('q', bytes(8 * (self.amount_nodes + 1)))
+        for e in range(len(head)):      # O(|E|), count the edges leaving each node
+            offsets[head[e ^ 1] + 1] += 1
+        for v in range(self.amount_nodes):  # O(|V|), prefix sum
+            offsets[v + 1] += offsets[v]
+        cursor = offsets[:-1]
+        order = array('i', bytes(4 * len(head)))
+        for e in range(len(head)):      # O(|E|)
+            start = head[e ^ 1]
+            order[cursor[start]] = e
+            cursor[start] += 1
+        self.offsets = offsets
+        self.order = order
+
+    def levels(self, source, sink):
+        """
+        This is the method to find the level of every node, its number of edges from source in the residual network, by BFS.
+
+        Input:
+            source: An int, the source node.
+            sink: An int, the sink node.
+        Return:
+            level: An array of the levels, -1 for the nodes source can not reach.
+        Time complexity:
+            best/worst: O(|V| + |E|)
+        Space complexity:
+            Aux: O(|V|)
+        """
+        head = self.head
+        capacity = self.capacity
+        offsets = self.offsets
+        order = self.order
+        level = array('i', [-1]) * self.amount_nodes
+        level[source] = 0
+        my_queue = deque([source])
+        while my_queue:
+            current = my_queue.popleft()
+            for i in range(offsets[current], offsets[current + 1]):
+                e = order[i]
+                if capacity[e] > 0 and level[head[e]] < 0:
+                    level[head[e]] = level[current] + 1
+                    if head[e] == sink:     # the nodes further away can not be on a shortest path to sink
+                        return level
+                    my_queue.append(head[e])
+        return level
+
+    def dinic(self, source, sink):
+        """
+        This is the method for finding the maximum flow from source to sink with Dinic's algorithm.
+
+        Approach: Each phase finds the levels of the nodes by BFS, see levels, and then a blocking flow on the level graph, the
+                    edges going from a level to the next one, until no path in the level graph is left. Then the next phase
+                    starts with new levels. The shortest path from source to sink gets longer in every phase, so there are
+                    at most |V| phases.
+
+                  The blocking flow is a DFS without recursion that keeps the path in a stack. Every node has a current arc,
+                    the first of its edges that may still lead to sink, so an edge that led to a dead end or got full is
+                    never looked at again in the phase. Once sink is reached, the smallest capacity of the path is pushed
+                    along it, and the search goes back to the start of the first edge that got full instead of the source.
+
+        Input:
+            source: An int, the source node.
+            sink: An int, the sink node.
+        Return:
+            max_flow: An int, the maximum flow.
+        Time complexity:
+            best/worst: O(|V|^2|E|), at most |V| phases of O(|V||E|) each.
+        Space complexity:
+            Aux: O(|V|), for the levels, the current arcs and the path.
+        """
+        if self.offsets is None:
+            self.finish()
+        head = self.head
+        capacity = self.capacity
+        offsets = self.offsets
+        order = self.order
+        max_flow = 0
+
+        while True:
+            level = self.levels(source, sink)       # O(|V| + |E|)
+            if level[sink] < 0:
+                return max_flow
+            current = offsets[:-1]                  # O(|V|), the current arc of every node
+            path = []                               # edges from source to the node the search is at
+            node = source
+            while True:
+                if node == sink:                    # push the smallest capacity along the path
+                    flow = min(capacity[e] for e in path)
+                    cut = -1
+                    for k in range(len(path)):
+                        e = path[k]
+                        capacity[e] -= flow
+                        capacity[e ^ 1] += flow
+                        if cut < 0 and capacity[e] == 0:
+                            cut = k
+                    max_flow += flow
+                    del path[cut:]                  # go back to the start of the first full edge
+                    node = head[path[-1]] if path else source
+                    continue
+
+                i = current[node]
+                end = offsets[node + 1]
+                while i < end:                      # find the next edge of the level graph with capacity left
+                    e = order[i]
+                    if capacity[e] > 0 and level[head[e]] == level[node] + 1:
+                        break
+                    i += 1
+                current[node] = i
+                if i < end:                         # advance
+                    path.append(order[i])
+                    node = head[order[i]]
+                elif path:                          # dead end, retreat and skip the edge that led here
+                    node = head[path.pop() ^ 1]
+                    current[node] += 1
+                else:                               # no path left in the level graph
+                    break
+
+    def global_relabel(self, sink, height):
+        """
+        This is the method to set the height of every node to its exact number of edges to sink in the residual network,
+        by a BFS from sink along the reverse edges, for push_relabel.
+
+        Input:
+            sink: An int, the sink node.
+            height: An array of the heights, changed in place. The nodes with a height of at least |V|, the source and the
+                    nodes already cut off from sink, keep it, and the nodes that can not reach sink get |V|.
+        Time complexity:
+            best/worst: O(|V| + |E|)
+        Space complexity:
+            Aux: O(|V|)
+        """
+        head = self.head
+        capacity = self.capacity
+        offsets = self.offsets
+        order = self.order
+        n = self.amount_nodes
+        for v in range(n):      # O(|V|)
+            if height[v] < n:
+                height[v] = -1
+        height[sink] = 0
+        my_queue = deque([sink])
+        while my_queue:
+            current = my_queue.popleft()
+            for i in range(offsets[current], offsets[current + 1]):
+                e = order[i]
+                start = head[e]
+                if height[start] < 0 and capacity[e ^ 1] > 0:   # start can still send along e ^ 1 to current
+                    height[start] = height[current] + 1
+                    my_queue.append(start)
+        for v in range(n):      # O(|V|)
+            if height[v] < 0:
+                height[v] = n
+
+    def push_relabel(self, source, sink):
+        """
+        This is the method for finding the maximum flow from source to sink with the highest label push-relabel algorithm.
+
+        Approach: Every edge leaving source is filled first, which leaves an excess of flow at the nodes it goes to. A node
+                    with an excess, an active node, pushes it along the edges to nodes exactly one lower than itself, and when
+                    it has none left, it is relabelled to one more than the lowest node it still has capacity to. The active
+                    node with the highest height is always the next one to be discharged, they are kept in a list for every
+                    height. Once no node is active, the excess at sink is the maximum flow.
+
+                  Two heuristics keep the amount of relabels low. A global relabel sets every height to the number of edges
+                    to sink, see global_relabel(), at the start and again after every |V| + |E| of relabelling work. And when
+                    a relabel leaves no node at some height h below |V|, no node above h can reach sink anymore (the gap),
+                    so all of them are lifted to |V| at once. Nodes at |V| or above are never discharged, as the flow they
+                    hold only goes back to source, which does not change the value of the flow.
+
+        Input:
+            source: An int, the source node.
+            sink: An int, the sink node.
+        Return:
+            max_flow: An int, the maximum flow.
+        Time complexity:
+            best/worst: O(|V|^2 sqrt(|E|))
+        Space complexity:
+            Aux: O(|V|), for the heights, the excesses, the current arcs and the lists of active nodes.
+        """
+        if self.offsets is None:
+            self.finish()
+        head = self.head
+        capacity = self.capacity
+        offsets = self.offsets
+        order = self.order
+        n = self.amount_nodes
+        if source == sink:
+            return 0
+
+        excess = array('q', bytes(8 * n))
+        height = array('i', bytes(4 * n))
+        height[source] = n
+        for i in range(offsets[source], offsets[source + 1]):  # O(|V|), fill the edges leaving source
+            e = order[i]
+            flow = capacity[e]
+            capacity[e] = 0
+            capacity[e ^ 1] += flow
+            excess[head[e]] += flow
+
+        limit = n + len(head)       # relabelling work between global relabels
+        work = limit
+        count = array('i', bytes(4 * n))    # number of nodes at each height below n
+        active = [[] for _ in range(n)]     # active nodes at each height below n
+        current = None
+        highest = -1
+
+        while True:
+            if work >= limit:       # O(|V| + |E|), global relabel, then rebuild the lists
+                work = 0
+                self.global_relabel(sink, height)
+                current = offsets[:-1]
+                count = array('i', bytes(4 * n))
+                for level in active:
+                    level.clear()
+                highest = -1
+                for v in range(n):
+                    if height[v] < n:
+                        count[height[v]] += 1
+                        if excess[v] > 0 and v != sink:
+                            active[height[v]].append(v)
+                            highest = max(highest, height[v])
+
+            while highest >= 0 and not active[highest]:
+                highest -= 1
+            if highest < 0:
+                return excess[sink]
+            node = active[highest].pop()
+            if height[node] >= n:       # lifted by a gap after it became active
+                continue
+
+            while excess[node] > 0 and work < limit:    # discharge node
+                i = current[node]
+                if i < offsets[node + 1]:
+                    e = order[i]
+                    end = head[e]
+                    if capacity[e] > 0 and height[node] == height[end] + 1:     # push
+                        flow = min(excess[node], capacity[e])
+                        capacity[e] -= flow
+                        capacity[e ^ 1] += flow
+                        excess[node] -= flow
+                        if excess[end] == 0 and end != sink:
+                            active[height[end]].append(end)
+                            highest = max(highest, height[end])
+                        excess[end] += flow
+                    else:
+                        current[node] = i + 1
+                    continue
+
+                old = height[node]      # relabel
+                new = n
+                for i in range(offsets[node], offsets[node + 1]):
+                    e = order[i]
+                    if capacity[e] > 0 and height[head[e]] < new:
+                        new = height[head[e]]
+                new = min(new + 1, n)
+                work += offsets[node + 1] - offsets[node] + 12
+                current[node] = offsets[node]
+                count[old] -= 1
+                if count[old] == 0:     # gap, nothing above old can reach sink
+                    for v in range(n):      # O(|V|)
+                        if old < height[v] < n:
+                            count[height[v]] -= 1
+                            height[v] = n
+                    new = n
+                height[node] = new
+                if new == n:
+                    break
+                count[new] += 1
+
+            if excess[node] > 0 and height[node] < n:   # stopped for a global relabel
+                active[height[node]].append(node)
+                highest = max(highest, height[node])
+
+
+def split_network(connections, maxIn, maxOut, origin, targets):
+    """
+    This is the function to build the FlowNetwork of maxThroughput with every data centre split into three nodes.
+
+    Approach: Data centre i becomes the nodes in(i) = 3i, mid(i) = 3i + 1 and out(i) = 3i + 2, the same layout as the Network
+                class, with an edge in(i) -> mid(i) of capacity maxIn[i] and an edge mid(i) -> out(i) of capacity maxOut[i].
+                Every connection (a, b, t) is an edge out(a) -> in(b) of capacity t, and every target t gets an edge mid(t) ->
+                sink. So the data coming into a centre is at most maxIn, the data leaving it is at most maxOut, and a target
+                can keep the data it received without using its maxOut, or send it on. The flow starts at mid(origin), the
+                origin does not receive its own data, and a target that is the origin itself is left out, as no data has to
+                be sent to it.
+
+                The sink edges get a capacity larger than every flow possible instead of inf, so all the capacities are ints.
+
+    Input:
+        connections, maxIn, maxOut, origin, targets: see maxThroughput.
+    Return:
+        network: The FlowNetwork, not finished yet.
+        source: An int, the source node.
+        sink: An int, the sink node.
+    Time complexity:
+        best/worst: O(|D| + |C| + |T|)
+    Space complexity:
+        Aux: O(|D| + |C| + |T|)
+    """
+    amount = len(maxIn)
+    sink = 3 * amount
+    network = FlowNetwork(sink + 1)
+    unlimited = sum(maxOut) + 1          # more than any flow, which is at most maxOut summed over the centres
+    for i in range(amount):      # O(|D|)
+        network.add_edge(3 * i, 3 * i + 1, maxIn[i])
+        network.add_edge(3 * i + 1, 3 * i + 2, maxOut[i])
+    for start, end, throughput in connections:  # O(|C|)
+        network.add_edge(3 * start + 2, 3 * end, throughput)
+    for t in set(targets):      # O(|T|)
+        if t != origin:
+            network.add_edge(3 * t + 1, sink, unlimited)
+    return network, 3 * origin + 1, sink
+
+
+def maxThroughput(connections, maxIn, maxOut, origin, targets, engine='ford_fulkerson'):
     """
     This is the method for finding the maximum flow of this network.
 
     Approach: Check the approaches for ford_fulkerson(self, origin) in the Network class as they're having the same approaches.
 
+              Every engine follows the same rules: the data coming into a data centre is at most maxIn, the data leaving it,
+                including the data sent by the origin, is at most maxOut, and the data a target stores is only limited by its
+                maxIn, as it does not leave the target. The origin does not count as a target, as it already has the data.
+
+              The 'dinic' engine builds a residual network with the same split data centres as the Network class in flat
+                arrays instead, see split_network(), and finds the max flow with Dinic's algorithm, see FlowNetwork.dinic().
+                It is much faster on dense networks.
+              The 'push_relabel' engine builds the same network and uses the highest label push-relabel algorithm, see
+                FlowNetwork.push_relabel(), which needs the fewest passes over very large and dense networks.
+
     Input:
         connections: A Connection object, representing the flow from one center to another center.
         maxIn: A list of integers in which maxIn[i] specifies the maximum amount of incoming data that data centre i can process per second.
         maxOut: A list of integers in which maxOut[i] specifies the maximum amount of outgoing data that data centre i can process per second.
         origin: The starting center id
         targets: A list of data centres that are deemed appropriate locations for the backup data to be stored.
+        engine: 'ford_fulkerson', 'dinic' or 'push_relabel'. Default = 'ford_fulkerson'
     Return:
         max_throughput: The maximum possible data throughput from the data centre origin to the data centres specified in targets.
     Time complexity:
         best/worst: O(|D||C|^2), as the ford_fulkerson(origin) is the method that contribute the most significant complexity.
+                    O(|D|^2|C|) with 'dinic'.
+                    O(|D|^2 sqrt(|C|)) with 'push_relabel'.
     Space complexity:
-        Aux: O(|D|), for making the parent array and a network array of size |D|. Where |D| is the numbers of data centers.
+        Aux: O(|D| + |C|), for making the parent array and the residual network. Where |D| is the numbers of data centers.
     """
+    if engine == 'dinic':
+        network, source, sink = split_network(connections, maxIn, maxOut, origin, targets)   # O(|D| + |C| + |T|)
+        return network.dinic(source, sink)     # O(|D|^2|C|)
+    if engine == 'push_relabel':
+        network, source, sink = split_network(connections, maxIn, maxOut, origin, targets)   # O(|D| + |C| + |T|)
+        return network.push_relabel(source, sink)      # O(|D|^2 sqrt(|C|))
+    if engine != 'ford_fulkerson':
+        raise ValueError("unknown max flow engine: " + repr(engine))
+
     residue = Network(maxIn, maxOut)    # O(|D|)
-    residue.add_connection_prep(connections, targets)  # O(|C| + |T|)
+    residue.add_connection_prep(connections, [t for t in targets if t != origin])  # O(|C| + |T|)
     max_throughput = residue.ford_fulkerson(origin)  # O(|D||C|^2)
     return max_throughput
 
 
+def cross_check(trials=200, size=10, seed=0):
+    """
+    This is the function to check the max flow engines of maxThroughput against each other on random networks.
+
+    Approach: Every trial makes a network of up to size data centres with random connections, maxIn, maxOut and targets,
+                where the origin can be one of the targets too, and runs maxThroughput with every engine on it. The 'dinic'
+                and 'push_relabel' engines have to give the same throughput as the existing 'ford_fulkerson' one, or a
+                ValueError is raised with the network.
+
+    Input:
+        trials: An int, the number of random networks. Default = 200
+        size: An int, the most data centres in a network, at least 2. Default = 10
+        seed: The seed of the random networks. Default = 0
+    Return:
+        checked: An int, the number of networks where all the engines gave the same throughput, which is trials.
+    Time complexity:
+        best/worst: O(trials * size^5), for ford_fulkerson on up to size^2 connections.
+    Space complexity:
+        Aux: O(size^2)
+    """
+    rng = Random(seed)
+    checked = 0
+    for _ in range(trials):
+        amount = rng.randint(2, size)
+        connections = []
+        for _ in range(rng.randint(0, amount * amount)):
+            start, end = rng.sample(range(amount), 2)
+            connections.append((start, end, rng.randint(1, 50)))
+        maxIn = [rng.randint(0, 100) for _ in range(amount)]
+        maxOut = [rng.randint(0, 100) for _ in range(amount)]
+        origin = rng.randrange(amount)
+        targets = rng.sample(range(amount), rng.randint(1, amount))
+
+        expected = maxThroughput(connections, maxIn, maxOut, origin, targets)
+        for engine in ('dinic', 'push_relabel'):
+            throughput = maxThroughput(connections, maxIn, maxOut, origin, targets, engine)
+            if throughput != expected:
+                raise ValueError(engine + " gives " + str(throughput) + " but ford_fulkerson gives " + str(expected) +
+                                 " for " + repr((connections, maxIn, maxOut, origin, targets)))
+        checked += 1
+    return checked
+
+
 # The following codes are for the assignment part 2, CatGPT
 class CatsTrie:
     """
@@ -5,7 +5,27 @@ Author: Lim Jun Yi
 student_id: 32625510
 Date: 2023/4/24
 """
-from math import inf
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from math import ceil, inf, pi, sqrt
+from mmap import mmap, ACCESS_READ
+from multiprocessing import shared_memory
+from random import Random
+from time import perf_counter
+import asyncio
+import json
+import os
+import sys
+import tracemalloc
+
+try:
+    import numpy as np
+except ImportError:     # numpy is optional, time_matrix falls back to plain loops without it, delta_stepping needs it
+    np = None
+
+# first number of the header of a file written by RoutePlanner.save, 'RTGRAPH1' in ascii
+GRAPH_MAGIC = 0x3148504152475452
 
 
 class MinHeap:
@@ -130,8 +150,8 @@ class MinHeap:
         """
         smallest = self.my_array[1][0]      # O(1)
         largest = self.my_array[self.length][0]
+        self.index_swap(smallest, largest)  # swap the index mapping for the two items, before they are swapped
         self.swap(1, self.length)           # swap the root( the smallest item ) with the last item in the heap, O(1)
-        self.index_swap(self.my_array[1][0], largest)         # swap the index mapping for the two items
         self.length -= 1                    # length decrease by 1, O(1)
         self.sink(1)                        # sink the swapped item to correct position
         return smallest                     # O(1)
@@ -187,382 +207,3527 @@ class MinHeap:
         self.my_array[index] = (location, key)  # O(1)
         self.rise(index)                        # O(log|L|)
 
+    def min_key(self):
+        """
+        This function return the key of the root of the heap, the shortest time from start of the discovered locations.
 
-class Graph:
+        Return:
+            the key of the root item, inf if the heap is empty.
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            O(1) for space complexity.
+            Aux: O(1), no additional space needed.
+        """
+        if self.length == 0:
+            return inf
+        return self.my_array[1][1]
+
+    def clear(self):
+        """
+        This function empties the heap so the same arrays can be reused by the next Dijkstra. The old items are left in
+        my_array and index_map, they are overwritten by add before they are read again.
+
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            O(1) for space complexity.
+            Aux: O(1), no additional space needed.
+        """
+        self.length = 0
+
+
+class BucketQueue:
     """
-    This is a class for making the Graph of locations and road, and searching for the shortest path using Dijkstra.
+    This class is a bucket queue (Dial's algorithm) for Dijkstra on roads whose travel times are non-negative integers.
+    It has the same add, update, serve, min_key and clear operations as MinHeap, without the O(log|L|) factor.
+
+    A location with key k is kept in bucket k % (C + 1), where C is the longest road time. Dijkstra serves keys in
+    increasing order and never adds a key more than C above the one it served last, so the live keys always fit in
+    C + 1 consecutive values and every bucket only holds one key at a time. update does not move the location out of
+    its old bucket, the old entry is left behind and dropped by serve when it no longer matches key_map.
 
     Author: Lim Jun Yi
     student_id: 32625510
     Date: 2023/4/24
     """
 
-    def __init__(self, locations):
+    def __init__(self, size, max_weight):
         """
-        Function description: This is the initialisation method for the Graph class.
+        This is the initialisation method for BucketQueue.
+
+        Input:
+            size: an int representing the amount of locations.
+            max_weight: an int, the longest road time C.
+        Time complexity:
+            best/worst: O(|L| + C), where |L| is the number of locations.
+        Space complexity:
+            Aux: O(|L| + C), for the buckets and the per location key map.
+        """
+        self.length = 0
+        self.current = 0                                        # the key served last, no key in the queue is smaller
+        self.amount = int(max_weight) + 1
+        self.buckets = [[] for _ in range(self.amount)]
+        self.key_map = array('d', [inf]) * size
+        self.in_queue = bytearray(size)
 
-        Approach description: It first finds the largest location id in 'locations', so we know the amount of locations and the
-                                size of the list we need. Then it creates a location object for each index in the list where it represented the
-                                location id.
+    def add(self, location, key):
+        """
+        This function adds a newly discovered location with key into its bucket.
 
         Input:
-            locations: a list of tuples where each tuple in the list represented a road. The tuple included the start(a),
-                        end(b), travel time for alone(c) and travelling time for carpool(d). (a, b, c, d)
+            location: an int representing the id of the location.
+            key: an integer time, at most C more than the key served last.
         Time complexity:
-            best/worst: O(|R| + |L|), where |R| is the number of roads and |L| is the number of locations.
-                            It first has to loop through the roads to find the max location id and loop through the
-                            range of amount_locations to assign the location object.
+            best/worst: O(1)
         Space complexity:
-            O(|L|) for space complexity as the input in size |L|.
-            Aux: O(|L|), where |L| is the number of locations.
+            Aux: O(1)
         """
-        self.amount_locations = max(r[1] for r in locations) + 1  # O(|R|), loop through roads
+        self.length += 1
+        self.in_queue[location] = True
+        self.key_map[location] = key
+        self.buckets[int(key) % self.amount].append(location)
 
-        self.locations = [None] * self.amount_locations      # O(|L|)
+    def update(self, location, key):
+        """
+        This function gives a location in the queue a smaller key, by adding it to the bucket of the new key.
 
-        for i in range(self.amount_locations):       # O(|L|)
-            self.locations[i] = Location(i)
+        Input:
+            location: an int representing the id of the location.
+            key: the new key, smaller than the current one.
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1)
+        """
+        self.key_map[location] = key
+        self.buckets[int(key) % self.amount].append(location)
 
-    def add_road_prep(self, roads, carpool):
+    def advance(self):
         """
-        Function description: This function is to extract the information from each road and create a Road object using the extracted information.
-                                The road then will be added into each location object inside the graph with their corresponding id and later be
-                                used in the Dijkstra's path algorithm.
+        This function moves current forward to the first bucket that holds a live location, dropping the old entries left
+        behind by update or by served locations on the way. The queue must not be empty.
 
-        Approach description: Two types of graph is being made base on the mode selected. A normal graph will be made if
-                                carpool lane is not being used while a reversed graph will be made if carpool lane is being used.
+        Time complexity:
+            best: O(1), when the current bucket still has a live location.
+            worst: O(C + e), where e is the number of old entries dropped. Over a whole Dijkstra it costs O(|R| + D) in
+                    total, where D is the largest time from start.
+        Space complexity:
+            Aux: O(1)
+        """
+        buckets = self.buckets
+        key_map = self.key_map
+        in_queue = self.in_queue
+        current = self.current
+        while True:
+            bucket = buckets[current % self.amount]
+            while bucket:
+                location = bucket[-1]
+                if in_queue[location] and key_map[location] == current:
+                    self.current = current
+                    return
+                bucket.pop()                                    # old entry
+            current += 1
 
-        Input:
-            roads: a list of tuples where each tuple in the list represented a road. The tuple included the start(a),
-                        end(b), travel time for alone(c) and travelling time for carpool(d). (a, b, c, d)
-            carpool: a boolean value, True if carpool lane being used, False otherwise.
+    def serve(self):
+        """
+        This function removes and returns a location with the smallest key.
+
+        Return:
+            the location with the smallest key.
         Time complexity:
-            best/worst: O(|R|), where |R| is the numbers of roads.
+            see advance.
         Space complexity:
-            O(|R|) for space complexity as the input is a list of roads, where |R| is the number of roads in 'roads'
-            Aux: O(1), no additional space needed.
+            Aux: O(1)
         """
-        for item in roads:      # O(|R|)
-            start = item[0]
-            end = item[1]
-            inv_time = item[2]
-            carp_time = item[3]
+        self.advance()
+        location = self.buckets[self.current % self.amount].pop()
+        self.in_queue[location] = False
+        self.length -= 1
+        return location
 
-            # conditioning, add roads for each location, if carpool then add time corresponding to carpool and vise versa
-            if not carpool:
-                current_road = Road(start, end, inv_time)   # O(1)
-                self.locations[start].add_road(current_road)  # O(1)
+    def min_key(self):
+        """
+        This function returns the smallest key in the queue, inf if it is empty.
 
-            else:
-                current_road = Road(end, start, carp_time)  # O(1)
-                self.locations[end].add_road(current_road)  # O(1)
+        Time complexity:
+            see advance.
+        Space complexity:
+            Aux: O(1)
+        """
+        if self.length == 0:
+            return inf
+        self.advance()
+        return self.current
 
-    def dijkstra(self, s):
+    def clear(self):
         """
-        Function description: This is a function to find the shortest path in a graph. It uses the MinHeap class where a minimum heap is being
-                                used to store the discovered locations. inspired from FIT2004 week 5 lecture notes.
+        This function empties the queue so it can be reused by the next search.
 
-        Approach description: The Dijkstra algorithm traverse through the graph and find all the shortest time from the
-                                current location to the source(s) location. It works by first searching through all the roads
-                                that pointed out from the source location and check whether the destination of that road
-                                has been discovered or visited yet. if not discovered, the destination(des) will be added
-                                to the heap and given a key where the key is the time taken from source to this location.
+        Time complexity:
+            best/worst: O(C + e), where e is the number of entries left in the buckets.
+        Space complexity:
+            Aux: O(1)
+        """
+        for bucket in self.buckets:
+            bucket.clear()
+        self.length = 0
+        self.current = 0
 
-                                if the current location is discovered, then if there's any shorter path being found, it will
-                                update the destination time from start to a shorter one and given it a new parent. The location
-                                will be sorted again to its correct position in the minheap.
 
-                                when the minheap is emtpy mean the traversal has finished and all location has its parent
-                                and shortest time from source.
+class RadixHeap:
+    """
+    This class is a radix heap for Dijkstra on roads whose travel times are non-negative integers. It has the same add,
+    update, serve, min_key and clear operations as MinHeap.
+
+    Every entry is kept in the bucket given by the highest bit in which its key differs from last, the key served last,
+    so bucket 0 only holds keys equal to last and bucket i keys between last + 2^(i-1) and last + 2^i - 1. When bucket
+    0 is empty, the first non-empty bucket is emptied into the lower ones after last moves to its smallest key. Since
+    keys only move to lower buckets, each entry is moved at most log(D) times, where D is the largest key. Like
+    BucketQueue, update leaves the old entry behind, it is dropped once it no longer matches key_map.
+
+    Author: Lim Jun Yi
+    student_id: 32625510
+    Date: 2023/4/24
+    """
+
+    def __init__(self, size):
+        """
+        This is the initialisation method for RadixHeap.
 
         Input:
-            s: an int representing the starting location of the graph
+            size: an int representing the amount of locations.
         Time complexity:
-            The time complexity of this Dijkstra path algorithm is O(|L|+|L|*log|L|*n*2*log|L|), which simplify to
-            O(|L|log|L|*nlog|L|), which can be further simplify to O(n|L|log|l|).
-            And n is the maximum number of roads attached to a single location, |L| is the number of locations, we can
-            conclude that n|L| = total number of roads and the final complexity will be O(|R|log|L|) where |R| is the total number of roads
-            and |L| is the number to locations.
+            best/worst: O(|L|), where |L| is the number of locations.
         Space complexity:
-            O(|L|) for space complexity as the input is only an integer, and we have to create a MinHeap to stores all the discovered locations
-            , O(|L| + 1) = O(|L|), where |L| is the number of locations.
-            Aux: O(|L|), for creating the MinHeap.
+            Aux: O(|L|), for the per location key map.
+        """
+        self.length = 0
+        self.last = 0
+        self.buckets = [[] for _ in range(65)]
+        self.key_map = array('d', [inf]) * size
+        self.in_queue = bytearray(size)
+
+    def add(self, location, key):
         """
-        self.locations[s].time_from_start = 0
-        discovered = MinHeap(self.amount_locations)               # O(|L|)
-        discovered.add(s, 0)                                    # O(1), first item, no need to rise.
-        self.locations[s].discovered = True
+        This function adds a newly discovered location with key, which can not be smaller than the key served last.
 
-        while discovered.length > 0:                            # O(|L|)
-            current = discovered.serve()                        # current = integer representing a location id         O(log|L|)
-            c_loc = self.locations[current]                     # c_loc = location obj
-            c_loc.visited = True
+        Input:
+            location: an int representing the id of the location.
+            key: an integer time.
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1)
+        """
+        self.length += 1
+        self.in_queue[location] = True
+        self.key_map[location] = key
+        self.buckets[(int(key) ^ self.last).bit_length()].append((location, key))
 
-            for road in c_loc.roads:                            # road = each edge of the vertex. (start, end, time)    O(n), where n is the numbers of roads start from each location
-                des = self.locations[road.end]                  # road.end is integer, des = location obj
+    def update(self, location, key):
+        """
+        This function gives a location in the queue a smaller key, by adding a new entry for it.
 
-                if not des.discovered:                          # if not discovered, add to heap.
-                    des.discovered = True
-                    des.time_from_start = c_loc.time_from_start + road.time
-                    des.previous = current
-                    discovered.add(des.id, des.time_from_start)     # O(log|L|)
+        Input:
+            location: an int representing the id of the location.
+            key: the new key, smaller than the current one.
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1)
+        """
+        self.key_map[location] = key
+        self.buckets[(int(key) ^ self.last).bit_length()].append((location, key))
 
-                elif not des.visited:                                              # if not visited, and there's shorter route, update it in heap.
-                    if des.time_from_start > c_loc.time_from_start + road.time:
-                        des.time_from_start = c_loc.time_from_start + road.time
-                        des.previous = current
-                        discovered.update(des.id, des.time_from_start)    # O(log|L|)
+    def pull(self):
+        """
+        This function makes sure the top of bucket 0 is a live entry with the smallest key. The queue must not be empty.
 
-    def path(self, end, carpool):
+        Time complexity:
+            amortised O(log D) for each entry, where D is the largest key.
+        Space complexity:
+            Aux: O(1)
         """
-        Function description: This is a function to return the path of the shortest path found by the Dijkstra algorithm. It searches through
-                                the self.previous instance variable in the location object and make a path list out of it.
+        buckets = self.buckets
+        key_map = self.key_map
+        in_queue = self.in_queue
+        first = buckets[0]
+        while first:
+            location, key = first[-1]
+            if in_queue[location] and key_map[location] == key:
+                return
+            first.pop()                                         # old entry
 
-        precondition: end is an integer representing the ending of a path and start != end.
-        post-condition: path will contain the locations for shortest path.
+        for i in range(1, 65):
+            bucket = buckets[i]
+            live = [entry for entry in bucket if in_queue[entry[0]] and key_map[entry[0]] == entry[1]]
+            bucket.clear()
+            if live:
+                self.last = last = int(min(entry[1] for entry in live))
+                for entry in live:                              # every entry moves to a lower bucket
+                    buckets[(int(entry[1]) ^ last).bit_length()].append(entry)
+                return
 
-        Approach description: Make a path array to store the path. Once it reaches a location with previous
-                                equal to None, the while loop exit and finishing finding the path. the index is used to
-                                keep track of the current last element in the array for path, so we can perform O(1) operation to
-                                add in new path location.
+    def serve(self):
+        """
+        This function removes and returns a location with the smallest key.
 
-                              The carpool param indicate whether we are finding a path for travelling alone or travelling
-                               using carpool lane. It's also been used to deciding whether to revert the path or slice the path
-                               from index 1 onwards till index. Useful for combining of two paths in OptimumRoute().
-        Input:
-            end: an int representing the destination.
-            carpool: a boolean value, True if finding path for using carpool lane, False otherwise.
         Return:
-            path[1:index]: path for travelling from 'end' to the destination using carpool lane
-            path[-index:]: path for travelling from the source to 'end' using only non-carpool lane.
+            the location with the smallest key.
         Time complexity:
-            best/worst: O(|L|), the while looping having overall O(|L|) complexity as it at most loop |L| times.
-                        Returning of the path required list slicing which is also O(|L|). O(|L| + |L|) = O(|L|)
-                        |L| is the number of locations.
+            amortised O(log D), where D is the largest key.
         Space complexity:
-            O(|L|) for space complexity as the input is only an integer and a boolean value, and a path array is needed to store the path from start to end.
-            Aux: O(|L|), extra spaces needed for path. |L| is the numbers of locations.
+            Aux: O(1)
+        """
+        self.pull()
+        location = self.buckets[0].pop()[0]
+        self.in_queue[location] = False
+        self.length -= 1
+        return location
 
+    def min_key(self):
         """
-        path = [None] * self.amount_locations       # O(|L|)
-        path[0] = end
-        index = 1
+        This function returns the smallest key in the queue, inf if it is empty.
 
-        while self.locations[end].previous is not None:     # O(|L|)
-            path[index] = self.locations[end].previous      # O(1)
-            end = self.locations[end].previous          # O(1)
-            index += 1
+        Time complexity:
+            amortised O(log D), where D is the largest key.
+        Space complexity:
+            Aux: O(1)
+        """
+        if self.length == 0:
+            return inf
+        self.pull()
+        return self.last
 
-        if carpool:
-            return path[1:index]     # O(|L|)
-        else:
-            reverse(path)      # O(|L|)
-            return path[-index:]       # O(|L|)
+    def clear(self):
+        """
+        This function empties the queue so it can be reused by the next search.
 
+        Time complexity:
+            best/worst: O(e), where e is the number of entries left in the buckets.
+        Space complexity:
+            Aux: O(1)
+        """
+        for bucket in self.buckets:
+            bucket.clear()
+        self.length = 0
+        self.last = 0
 
-def reverse(lst):
-    """
-    A function to reverse a list
 
-    Input:
-        lst: a list of item.
-    Return:
-        lst: a list that has been reversed.
-    Time complexity:
-        best/worst: O(n), where n is the number of items in the list.
-    Space complexity:
-        O(n) for space complexity, where n is the number of items in the list.
-        Aux: O(1), no additional space is needed.
+class RouteStats:
     """
-    m = len(lst) // 2   # O(1)
-    n = len(lst) - 1    # O(1)
-
-    for i in range(m):          # O(n/2)
-        lst[i], lst[n] = lst[n], lst[i]
-        n -= 1
-    return lst
+    This is a class for the counters and phase timings collected while RoutePlanner answers queries, see
+    RoutePlanner.watch. Nothing is collected unless a RouteStats is given to a planner, and the only cost left in the
+    searches without one is a check for None once for every served location.
 
+    The counters are totals over every search since the object was made or reset:
+        heap_adds, heap_updates, heap_serves: the calls to add, update and serve of the priority queues of the graphs.
+        discovered: locations added to a queue, once for each search that found them.
+        settled: locations whose roads were looked at, once for each search that visited them.
+        relaxations: roads looked at by the searches.
+        queries: the number of route calls.
+    phases maps the name of a phase to the total wall time spent in it, in seconds: 'build' for reading the roads and
+    building the graphs, 'search_alone', 'search_carpool' and 'search_layered' for the searches, 'pickup' for
+    passenger_pickup and 'path' for putting the path together.
 
-class Location:
-    """
-    This class is for creating the location(vertex) for the Graph class. Each location will have 6 instance variables
-     upon initiation.
+    Searches of the 'ch' engine run on the hierarchy instead of the graphs, only their phase times are recorded.
 
     Author: Lim Jun Yi
     student_id: 32625510
     Date: 2023/4/24
     """
 
-    def __init__(self, location_id):
+    def __init__(self, callback=None):
         """
-        This is the initialisation method for the Location class. Creating instance variable for each location in graph.
+        This is the initialisation method for the RouteStats class.
 
         Input:
-            location_id: an int representing the location.
+            callback: a function called with this object after every route call, for example to send the numbers to a
+                        metrics system. Default = None
         Time complexity:
             best/worst: O(1)
         Space complexity:
-            O(1) for space complexity.
-            Aux: O(1), no additional space needed.
+            Aux: O(1)
         """
-        self.id = location_id
-        self.roads = []     # a list containing all road that start from self
-        self.time_from_start = inf     # set time taken from source to inf, so we can change we found a shorter time
-        # backtracking uses for path
-        self.previous = None
-        self.discovered = False
-        self.visited = False
+        self.callback = callback
+        self.mark = 0.0             # perf_counter at the end of the last phase
+        self.reset()
 
-    def add_road(self, road):
+    def reset(self):
         """
-        This is a method for adding the road to the 'roads' instance variable for location.
+        This function sets every counter and phase time back to zero.
 
-        Input:
-            road: a road object where it started from this location and end somewhere.
         Time complexity:
             best/worst: O(1)
         Space complexity:
-            O(1) for space complexity as the input is a Road object.
             Aux: O(1)
         """
-        self.roads.append(road)
+        self.heap_adds = 0
+        self.heap_updates = 0
+        self.heap_serves = 0
+        self.discovered = 0
+        self.settled = 0
+        self.relaxations = 0
+        self.queries = 0
+        self.phases = {}
 
+    def start(self):
+        """
+        This function starts timing a new phase from now.
 
-class Road:
-    """
-    This class is for creating the road(edge) object for the Graph class. Each road will consist of a starting point(start)
-    , ending point(end) and the time taken to travel.
-
-    Author: Lim Jun Yi
-    student_id: 32625510
-    Date: 2023/4/24
-    """
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1)
+        """
+        self.mark = perf_counter()
 
-    def __init__(self, start, end, time):
+    def lap(self, phase):
         """
-        This is the initialisation method for the Road class. Create the object with 3 attributes, start, end and time.
+        This function adds the time since the end of the last phase to phase, and starts the next phase.
 
         Input:
-            start: an int representing the starting location of this road.
-            end: an int representing the ending location of this road.
-            time: an int representing the time taken to travel from start to end on this road.
+            phase: a str, the name of the phase that just ended.
         Time complexity:
             best/worst: O(1)
         Space complexity:
-            O(1) for space complexity.
-            Aux: O(1), no additional space needed.
+            Aux: O(1)
         """
-        self.start = start  # start
-        self.end = end      # stop
-        self.time = time  # time taken for alone
-
-
-def optimalRoute(start, end, passengers, roads):
-    """
-    Function description: This function is used to find the fastest route between start and end. It achieved the goal
-                            by representing the roads in a graph form and uses dijkstra's algorithm to find the shortest time
-                            for each location form the start.
-
-    Approach description: The approach is to first make two graph representing travelling alone without using any carpool lane
-                            and make another graph for only travelling using carpool lane, which this graph is in reverse.
-                            Then followed by adding the roads for each location in the graph, which is done by the add_road_prep
-                            function in the Graph class.
-                            Two dijkstra will run simultaneously to find the shortest time form source for each location in the graph,
-                            where for travelling alone it starts from 'start' to 'end'; and 'end' to 'start' for travelling with
-                            carpool.
-                            After the dijkstra has complete, a function called passenger_pickup will determine whether is it worth it
-                            to pick up any passenger alone the way by comparing the time from start for the destination location.
-                            If not worth it the function return the shortest path for travelling alone and vise versa.
-    Input:
-        start: an int, departure location.
-        end: an int, destination location.
-        passengers: a list locations where there are potential passengers.
-        roads: a list of roads with the corresponding travel times
-    Return:
-        carpool_travel: The shortest path for travelling where it picked up a passenger.
-        alone_travel: The shortest path for travelling where it doesn't pick up passenger.
-    Time complexity:
-        Best/Worst: O(|R|log|L|), as this is the most significant complexity in the function.
-                    where |R| is numbers of roads and |L| is the number of locations. Break down see individual function's doc above.
-    Space complexity:
-        The space complexity will be O(|L| + |P| + |R|), simplify to O(|L| + |R|), where |L| is the number of unique locations
-                in the 'roads' and |R| is the number of roads.
-        Aux: O(|L|), Graph(), dijkstra and the output path list both required O(|L|) aux space. O(|L|)+O(|L|)+O(|L|)+O(|L|)+O(|L|)+O(|L|) = O(|L|)
+        now = perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self.mark
+        self.mark = now
 
-    """
+    def finish(self):
+        """
+        This function counts a finished route call and gives the stats to the callback.
 
-    # make a graph consisted of all the locations for traveling alone and travelling with carpool
-    alone = Graph(roads)    # O(|R| + |L|), Aux: O(|L|)
-    carpool = Graph(roads)  # O(|R| + |L|), Aux: O(|L|)
-    # add the roads to each corresponding location, if using carpool then True for the second param
-    alone.add_road_prep(roads, False)   # O(|R|), Aux: O(1)
-    carpool.add_road_prep(roads, True)  # O(|R|), Aux: O(1)
-    # conducting Dijkstra on the two graph to find the distances from source for each location
-    alone.dijkstra(start)   # O(|R|log|L|), Aux: O(|L|)
-    carpool.dijkstra(end)   # O(|R|log|L|), Aux: O(|L|)
+        Time complexity:
+            best/worst: O(1), plus the callback.
+        Space complexity:
+            Aux: O(1)
+        """
+        self.queries += 1
+        if self.callback is not None:
+            self.callback(self)
 
-    def passenger_pickup(p_location, end):
+    def as_dict(self):
         """
-        This function to find the best place to pick up the passenger.
+        This function returns the counters and phase times as a plain dict, ready to be exported.
 
-        Input:
-            p_location: a list locations where there are potential passengers.
-            end: an int presenting the destination location
         Return:
-            pick_up: the location to pick up the passenger, None if all passenger location slow you down.
+            a dict with one key for each counter and 'phases' with a copy of the phase times.
         Time complexity:
-            best/worst: O(|P|), where |P| is the number of locations where there are potential passengers.
+            best/worst: O(1)
         Space complexity:
-            The space complexity is O(P) where P is the numbers of locations with passenger.
-            Aux: O(1), no additional space is needed
+            Aux: O(1)
         """
-        comb_time = alone.locations[end].time_from_start    # use the shortest time for travelling along as base case
-        pick_up = None
-        for p in p_location:    # O(|P|)
-            if alone.locations[p].time_from_start + carpool.locations[p].time_from_start < comb_time:
-                comb_time = alone.locations[p].time_from_start + carpool.locations[p].time_from_start   # O(1)
-                pick_up = p     # O(1)
-        return pick_up
-
-    alone_travel = alone.path(end, False)   # O(|L|), Aux: O(|L|)
-    pickup_loc = passenger_pickup(passengers, end)    # O(|P|)
-
-    # if it's worth picking up passenger
-    if pickup_loc is not None:
-        carpool_travel = alone.path(pickup_loc, False) + carpool.path(pickup_loc, True)     # O(|L| + |L|), Aux: O(|L|)
-        return carpool_travel  # O(|L|)
+        return {'queries': self.queries, 'heap_adds': self.heap_adds, 'heap_updates': self.heap_updates,
+                'heap_serves': self.heap_serves, 'discovered': self.discovered, 'settled': self.settled,
+                'relaxations': self.relaxations, 'phases': dict(self.phases)}
 
-    # if it's not worth picking up passenger
-    return alone_travel         # O(|L|)
 
+class CountingQueue:
+    """
+    This is a class wrapping a MinHeap, BucketQueue or RadixHeap of a Graph to count the calls to it in a RouteStats.
+    It is only put in place by Graph.watch, so the queues of a graph that is not watched pay nothing.
 
-def select_sections(occupancy_probability):
+    Author: Lim Jun Yi
+    student_id: 32625510
+    Date: 2023/4/24
     """
-    Function description: This function uses the dynamic programming to find the best place to store the HPC with the goal of using the minimum total space.
-                            It returns a list consist of an integer which is the total space occupy by the placement of HPC and a list of tuples represents the
-                            location of one section selected for removal.
 
-    Approach description: The function will first find out the dimension of the given input(n*m), where n is the number of rows and m is the number of columns.
-                            After knowing the dimension, I built a memo which is a matrix of the same size n*m to stores all the tabulated values from the recurrence relation,
+    def __init__(self, queue, stats):
+        """
+        This is the initialisation method for the CountingQueue class.
+
+        Input:
+            queue: the queue to wrap.
+            stats: the RouteStats to count in.
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1)
+        """
+        self.queue = queue
+        self.stats = stats
+
+    @property
+    def length(self):
+        """
+        The number of items in the wrapped queue.
+        """
+        return self.queue.length
+
+    def add(self, location, key):
+        """
+        This function adds location to the wrapped queue and counts it, see MinHeap.add.
+        """
+        self.stats.heap_adds += 1
+        self.stats.discovered += 1
+        self.queue.add(location, key)
+
+    def update(self, location, key):
+        """
+        This function lowers the key of location in the wrapped queue and counts it, see MinHeap.update.
+        """
+        self.stats.heap_updates += 1
+        self.queue.update(location, key)
+
+    def serve(self):
+        """
+        This function serves the wrapped queue and counts it, see MinHeap.serve.
+        """
+        self.stats.heap_serves += 1
+        return self.queue.serve()
+
+    def min_key(self):
+        """
+        This function returns the smallest key of the wrapped queue, see MinHeap.min_key.
+        """
+        return self.queue.min_key()
+
+    def clear(self):
+        """
+        This function empties the wrapped queue, see MinHeap.clear.
+        """
+        self.queue.clear()
+
+
+class Graph:
+    """
+    This is a class for making the Graph of locations and road, and searching for the shortest path using Dijkstra.
+
+    The roads are stored in compressed sparse row (CSR) form instead of one object per location and per road. For every
+    location v, the roads leaving v are targets[offsets[v]:offsets[v+1]] with the matching times in weights, and the
+    same layout is kept for the reversed roads in r_offsets, r_targets and r_weights. The state Dijkstra needs for each
+    location (time_from_start, previous, discovered, visited) lives in flat arrays indexed by the location id.
+
+    The priority queue used by dijkstra and bidirectional is chosen with set_queue, a MinHeap for any road times, or a
+    BucketQueue or RadixHeap when every road time is a non-negative integer.
+
+    The graph can be searched many times. Instead of resetting the per location arrays before every search, each search
+    gets a new epoch number, discovered[v] and visited[v] store the epoch in which v was last discovered and visited,
+    and time_from_start[v] and previous[v] are only meaningful when discovered[v] is the current epoch.
+
+    Author: Lim Jun Yi
+    student_id: 32625510
+    Date: 2023/4/24
+    """
+
+    def __init__(self, locations):
+        """
+        Function description: This is the initialisation method for the Graph class.
+
+        Approach description: It first finds the largest location id at either end of a road in 'locations', so we know the
+                                amount of locations and the size of the arrays we need. Then it creates one flat array for each piece of per location state,
+                                where the index of the array represented the location id. The roads are added later by add_road_prep.
+
+        Input:
+            locations: a list of tuples where each tuple in the list represented a road. The tuple included the start(a),
+                        end(b), travel time for alone(c) and travelling time for carpool(d). (a, b, c, d)
+        Time complexity:
+            best/worst: O(|R| + |L|), where |R| is the number of roads and |L| is the number of locations.
+                            It first has to loop through the roads to find the max location id and then fill the
+                            per location arrays.
+        Space complexity:
+            O(|L|) for space complexity as the input in size |L|.
+            Aux: O(|L|), where |L| is the number of locations.
+        """
+        self.allocate(max(max(r[0], r[1]) for r in locations) + 1)     # O(|R| + |L|), loop through roads for the max location id
+
+    def allocate(self, amount_locations):
+        """
+        This function makes the empty road arrays and the per location search state for amount_locations locations, the
+        rest of __init__ after the amount of locations is known.
+
+        Input:
+            amount_locations: an int, the number of locations.
+        Time complexity:
+            best/worst: O(|L|)
+        Space complexity:
+            Aux: O(|L|)
+        """
+        self.amount_locations = amount_locations
+
+        # roads in both directions, empty until add_road_prep is called
+        self.offsets = array('q', bytes(8 * (self.amount_locations + 1)))     # O(|L|)
+        self.targets = array('i')
+        self.weights = array('d')
+        self.r_offsets = array('q', bytes(8 * (self.amount_locations + 1)))   # O(|L|)
+        self.r_targets = array('i')
+        self.r_weights = array('d')
+        # where the i-th road given to add_road_prep is stored in each direction, used by change_road
+        self.positions = array('q')
+        self.r_positions = array('q')
+        self.version = 0                                                      # increased whenever a road time changes
+
+        # per location state for dijkstra, previous is -1 when there is no parent
+        self.time_from_start = array('d', [inf]) * self.amount_locations     # O(|L|)
+        self.previous = array('i', [-1]) * self.amount_locations             # O(|L|)
+        self.discovered = array('I', bytes(4 * self.amount_locations))       # O(|L|), epoch stamps
+        self.visited = array('I', bytes(4 * self.amount_locations))          # O(|L|), epoch stamps
+        self.epoch = 0
+        self.complete = False                   # True while the last search was a full dijkstra, see change_road
+        self.queue_kind = 'heap'
+        self.heap = MinHeap(self.amount_locations)                           # O(|L|), reused by every search
+        self.stats = None                                                    # the RouteStats of watch, None when not watched
+
+        # state of the search on the reversed roads, only made when bidirectional is first used
+        self.b_time = None
+        self.b_next = None
+        self.b_discovered = None
+        self.b_visited = None
+        self.b_heap = None
+        # lower bound of the time to the targets of astar for each discovered location, only made when astar is first used
+        self.estimate = None
+        self.astar_heap = None
+        # heap of change_road, only made on the first repair
+        self.repair_heap = None
+        self.in_repair = None
+        # (delta, version, light roads, heavy roads) of the last delta_stepping, see delta_split
+        self.delta_roads = None
+
+    @staticmethod
+    def empty(amount_locations):
+        """
+        This function makes a graph of amount_locations locations without any roads, to be filled by set_roads.
+
+        Input:
+            amount_locations: an int, the number of locations.
+        Return:
+            graph: the new Graph.
+        Time complexity:
+            best/worst: O(|L|)
+        Space complexity:
+            Aux: O(|L|)
+        """
+        graph = Graph.__new__(Graph)
+        graph.allocate(amount_locations)        # O(|L|)
+        return graph
+
+    @staticmethod
+    def from_csr(offsets, targets, weights, r_offsets=None, r_targets=None, r_weights=None):
+        """
+        This function makes a graph straight from road arrays in CSR form, for example arrays kept in shared memory by
+        another process, without a roads list. The arrays are used as they are, not copied, so they can be any sequence
+        supporting indexing such as an array or a memoryview cast to the right type. Without the reversed arrays the graph
+        has no reversed roads, which is enough for dijkstra without reverse. change_road can not be used on such a graph.
+
+        Input:
+            offsets, targets, weights: the roads of the graph, see the class docstring.
+            r_offsets, r_targets, r_weights: the reversed roads. Default = None, no reversed roads.
+        Return:
+            graph: a Graph over len(offsets) - 1 locations.
+        Time complexity:
+            best/worst: O(|L|), for the per location state.
+        Space complexity:
+            Aux: O(|L|)
+        """
+        graph = Graph.empty(len(offsets) - 1)   # O(|L|)
+        graph.offsets = offsets
+        graph.targets = targets
+        graph.weights = weights
+        if r_offsets is not None:
+            graph.r_offsets = r_offsets
+            graph.r_targets = r_targets
+            graph.r_weights = r_weights
+        return graph
+
+    def new_epoch(self):
+        """
+        Function description: This function starts a new search on the graph, every location becomes undiscovered and
+                                unvisited without touching the per location arrays.
+
+        Approach description: The epoch number is increased by one, so the stamps written by the older searches no longer
+                                match. The stamps are only cleared when the epoch number is about to overflow the 32 bit
+                                array, which happens once every 2^32 - 1 searches.
+
+        Return:
+            epoch: an int, the epoch number of the new search.
+        Time complexity:
+            best/worst: O(1), amortised, the O(|L|) clearing only happens once every 2^32 - 1 searches.
+        Space complexity:
+            O(1) for space complexity.
+            Aux: O(1), no additional space needed.
+        """
+        if self.epoch == 0xFFFFFFFF:
+            self.discovered = array('I', bytes(4 * self.amount_locations))      # O(|L|)
+            self.visited = array('I', bytes(4 * self.amount_locations))         # O(|L|)
+            self.epoch = 0
+        self.epoch += 1
+        self.complete = False
+        return self.epoch
+
+    def set_queue(self, kind):
+        """
+        Function description: This function chooses the priority queue used by dijkstra and bidirectional.
+
+        Approach description: 'heap' is the MinHeap and works for any road times. 'bucket' (BucketQueue) and 'radix'
+                                (RadixHeap) need every road time to be a non-negative integer, which is checked here, and
+                                serve in O(1) and amortised O(log D) instead of O(log|L|). The bucket queue is the better
+                                choice when the longest road time is small, the radix heap when it is not. astar always
+                                uses a MinHeap, since its keys are not plain times from start.
+
+        Input:
+            kind: 'heap', 'bucket' or 'radix'.
+        Time complexity:
+            best/worst: O(|R| + |L|), for checking the road times and making the queues.
+        Space complexity:
+            Aux: O(|L| + C), for the queues, where C is the longest road time.
+        """
+        if kind not in ('heap', 'bucket', 'radix'):
+            raise ValueError("unknown queue kind: " + repr(kind))
+        if kind != 'heap':
+            for time in self.weights:                   # O(|R|), the reversed roads have the same times
+                if time < 0 or time != int(time):
+                    raise ValueError("the '" + kind + "' queue needs every road time to be a non-negative integer")
+        self.queue_kind = kind
+        self.heap = self.make_queue()
+        if self.b_heap is not None:
+            self.b_heap = self.make_queue()
+
+    def make_queue(self):
+        """
+        This function makes an empty priority queue of the kind chosen with set_queue, wrapped in a CountingQueue when
+        the graph is watched.
+
+        Return:
+            a MinHeap, BucketQueue or RadixHeap for the locations of the graph.
+        Time complexity:
+            best/worst: O(|L| + C), where C is the longest road time.
+        Space complexity:
+            Aux: O(|L| + C)
+        """
+        if self.queue_kind == 'bucket':
+            queue = BucketQueue(self.amount_locations, max(self.weights, default=0))
+        elif self.queue_kind == 'radix':
+            queue = RadixHeap(self.amount_locations)
+        else:
+            queue = MinHeap(self.amount_locations)
+        return self.count(queue)
+
+    def count(self, queue):
+        """
+        This function wraps queue in a CountingQueue if the graph is watched, and unwraps it if the graph is not.
+
+        Input:
+            queue: a priority queue of the graph, or None.
+        Return:
+            the queue to use.
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1)
+        """
+        if isinstance(queue, CountingQueue):
+            queue = queue.queue
+        if queue is None or self.stats is None:
+            return queue
+        return CountingQueue(queue, self.stats)
+
+    def watch(self, stats):
+        """
+        This function starts counting the work of the searches of the graph in stats, or stops counting if stats is None.
+
+        Input:
+            stats: a RouteStats, or None.
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1)
+        """
+        self.stats = stats
+        self.heap = self.count(self.heap)
+        self.b_heap = self.count(self.b_heap)
+        self.astar_heap = self.count(self.astar_heap)
+
+    def get_time(self, location):
+        """
+        Function description: This function returns the time from the source of the last search to location.
+
+        Input:
+            location: an int representing the location id.
+        Return:
+            The time taken from the source to location, inf if location was not visited by the last search.
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            O(1) for space complexity.
+            Aux: O(1), no additional space needed.
+        """
+        if self.visited[location] != self.epoch:
+            return inf
+        return self.time_from_start[location]
+
+    def add_road_prep(self, roads, carpool):
+        """
+        Function description: This function is to extract the information from each road and store it in the compressed
+                                sparse row arrays of the graph, which later be used in the Dijkstra's path algorithm.
+
+        Approach description: Two types of graph is being made base on the mode selected. A normal graph will be made if
+                                carpool lane is not being used while a reversed graph will be made if carpool lane is being used.
+                                The start, end and time of every road are first copied into three flat arrays, then the roads
+                                are grouped by their start location (and again by their end location for the reversed
+                                direction) with a counting sort, see compress().
+
+        Input:
+            roads: a list of tuples where each tuple in the list represented a road. The tuple included the start(a),
+                        end(b), travel time for alone(c) and travelling time for carpool(d). (a, b, c, d)
+            carpool: a boolean value, True if carpool lane being used, False otherwise.
+        Time complexity:
+            best/worst: O(|R| + |L|), where |R| is the numbers of roads and |L| is the number of locations.
+        Space complexity:
+            O(|R|) for space complexity as the input is a list of roads, where |R| is the number of roads in 'roads'
+            Aux: O(|R| + |L|), for the CSR arrays of both directions.
+        """
+        starts = array('i')
+        ends = array('i')
+        times = array('d')
+
+        for item in roads:      # O(|R|)
+            # conditioning, if carpool then the road is reversed and uses the carpool time and vise versa
+            if not carpool:
+                starts.append(item[0])
+                ends.append(item[1])
+                times.append(item[2])
+            else:
+                starts.append(item[1])
+                ends.append(item[0])
+                times.append(item[3])
+
+        self.set_roads(starts, ends, times)     # O(|R| + |L|)
+
+    def set_roads(self, starts, ends, times):
+        """
+        This function stores the roads given as three flat arrays in the CSR arrays of the graph, grouped by their start
+        location for the roads and by their end location for the reversed roads, see compress().
+
+        Input:
+            starts: an array of ints, the start location of each road.
+            ends: an array of ints, the end location of each road.
+            times: an array of travel times, the time taken for each road.
+        Time complexity:
+            best/worst: O(|R| + |L|)
+        Space complexity:
+            Aux: O(|R| + |L|), for the CSR arrays of both directions.
+        """
+        self.offsets, self.targets, self.weights, self.positions = compress(self.amount_locations, starts, ends, times)         # O(|R| + |L|)
+        self.r_offsets, self.r_targets, self.r_weights, self.r_positions = compress(self.amount_locations, ends, starts, times)   # O(|R| + |L|)
+
+    def dijkstra(self, s, targets=None, bound=inf, reverse=False, switches=None):
+        """
+        Function description: This is a function to find the shortest path in a graph. It uses the MinHeap class where a minimum heap is being
+                                used to store the discovered locations, or the queue chosen with set_queue. inspired from FIT2004 week 5 lecture notes.
+
+        Approach description: The Dijkstra algorithm traverse through the graph and find all the shortest time from the
+                                current location to the source(s) location. It works by first searching through all the roads
+                                that pointed out from the source location and check whether the destination of that road
+                                has been discovered or visited yet. if not discovered, the destination(des) will be added
+                                to the heap and given a key where the key is the time taken from source to this location.
+
+                                if the current location is discovered, then if there's any shorter path being found, it will
+                                update the destination time from start to a shorter one and given it a new parent. The location
+                                will be sorted again to its correct position in the minheap.
+
+                                when the minheap is emtpy mean the traversal has finished and all location has its parent
+                                and shortest time from source.
+
+                                The arrays of the graph are bound to local names before the loop, so the inner loop only does
+                                array indexing instead of attribute lookups. A new epoch is started first, so the results of the
+                                previous search are dropped in O(1) and the heap of the graph is emptied and reused.
+
+                                The search can stop early. If targets is given, it stops as soon as every location in targets has
+                                been visited, since their time from start can not change after that. If bound is given, it stops
+                                when the served location is at least bound away from the source, all the locations that are not
+                                visited yet are at least as far. Locations that are not visited when the search stops count as not
+                                reached, see get_time() and path().
+
+                                With reverse the search follows the reversed roads, so time_from_start[v] becomes the time
+                                from v to s instead.
+
+                                switches adds roads that only exist for this search and take no time, from a location to the
+                                location it is mapped to. RoutePlanner.layered_route uses them to switch from the alone layer
+                                to the carpool layer at the passenger locations.
+
+        Input:
+            s: an int representing the starting location of the graph
+            targets: an iterable of location ids, stop once all of them are visited. Default = None, visit every location.
+            bound: a time, stop once the closest location left in the heap is at least this far. Default = inf.
+            reverse: a boolean value, True to search on the reversed roads. Default = False
+            switches: a dict from location to location, the extra roads with no travel time. Default = None, no extra roads.
+        Time complexity:
+            The time complexity of this Dijkstra path algorithm is O(|R|log|L|) where |R| is the total number of roads
+            and |L| is the number to locations, every road is relaxed once and each relaxation costs at most one heap operation.
+            With targets or bound, only the roads of the locations closer than the last target or the bound are relaxed.
+        Space complexity:
+            O(|L|) for space complexity as the input is only an integer, and the MinHeap of the graph stores all the discovered locations
+            , O(|L| + 1) = O(|L|), where |L| is the number of locations.
+            Aux: O(1), the MinHeap and the per location arrays are made once in __init__ and reused.
+        """
+        epoch = self.new_epoch()                                # O(1), forget the previous search
+        if not reverse:
+            offsets = self.offsets
+            heads = self.targets
+            weights = self.weights
+        else:
+            offsets = self.r_offsets
+            heads = self.r_targets
+            weights = self.r_weights
+        time_from_start = self.time_from_start
+        previous = self.previous
+        discovered = self.discovered
+        visited = self.visited
+
+        time_from_start[s] = 0
+        previous[s] = -1
+        heap = self.heap
+        heap.clear()                                            # O(1)
+        heap.add(s, 0)                                          # O(1), first item, no need to rise.
+        discovered[s] = epoch
+
+        stats = self.stats
+        remaining = None
+        if targets is not None:
+            remaining = set(targets)                            # O(|T|), the targets that are not visited yet
+            if not remaining:
+                return
+
+        while heap.length > 0:                                  # O(|L|)
+            current = heap.serve()                              # current = integer representing a location id         O(log|L|)
+            current_time = time_from_start[current]
+            if current_time >= bound:                           # every location left is at least bound away
+                return
+            visited[current] = epoch
+
+            if remaining is not None and current in remaining:  # O(1)
+                remaining.discard(current)
+                if not remaining:                               # all targets are visited
+                    return
+
+            if stats is not None:
+                stats.settled += 1
+                stats.relaxations += offsets[current + 1] - offsets[current]
+
+            if switches is not None and current in switches:   # O(1), the extra road of current takes no time
+                des = switches[current]
+                if discovered[des] != epoch:
+                    discovered[des] = epoch
+                    time_from_start[des] = current_time
+                    previous[des] = current
+                    heap.add(des, current_time)
+                elif visited[des] != epoch and time_from_start[des] > current_time:
+                    time_from_start[des] = current_time
+                    previous[des] = current
+                    heap.update(des, current_time)
+
+            for i in range(offsets[current], offsets[current + 1]):    # each road leaving current, O(n) where n is the numbers of roads start from each location
+                des = heads[i]
+                des_time = current_time + weights[i]
+
+                if discovered[des] != epoch:                    # if not discovered, add to heap.
+                    discovered[des] = epoch
+                    time_from_start[des] = des_time
+                    previous[des] = current
+                    heap.add(des, des_time)                     # O(log|L|)
+
+                elif visited[des] != epoch:                     # if not visited, and there's shorter route, update it in heap.
+                    if time_from_start[des] > des_time:
+                        time_from_start[des] = des_time
+                        previous[des] = current
+                        heap.update(des, des_time)              # O(log|L|)
+
+        self.complete = not reverse and switches is None        # every location reachable from s is visited
+
+    def delta_stepping(self, s, delta=None):
+        """
+        Function description: This function finds the shortest time from s to every location like a full dijkstra, with
+                                the delta-stepping algorithm in NumPy, for large graphs where the Python loop of dijkstra is
+                                the bottleneck.
+
+        Approach description: The locations are put in buckets of width delta by their time from s. The roads are split
+                                into light roads, no longer than delta, and heavy roads. The lowest bucket that still has a
+                                location in it is settled in rounds: all the light roads of the locations whose time went
+                                down in the last round are relaxed at once, until no time in the bucket goes down any more.
+                                A light road can lead back into the same bucket, a heavy road can not, so the heavy roads of
+                                the bucket are relaxed once afterwards. Every location is then final, as no later bucket
+                                can give it a shorter time.
+
+                              Each round is a few whole-array NumPy steps instead of a heap operation for each road: the
+                                roads of the round are gathered from the CSR arrays, sorted by their end location and time,
+                                and the shortest road into each location wins if it beats the current time, see relax_batch.
+                                A small delta gives few rounds of repeated work, like dijkstra. A large delta gives larger
+                                rounds that may do extra relaxations, like Bellman-Ford. The default delta is the mean road
+                                time.
+
+                              The result is written into the per location arrays of the graph for a new epoch, so
+                                get_time, path, passenger_pickup and change_road use it as the result of a full dijkstra.
+
+        Input:
+            s: an int representing the starting location of the graph
+            delta: the bucket width, a positive time. Default = None, the mean road time.
+        Time complexity:
+            best/worst: O(B|L| + k log k), where B is the number of buckets in use and k the number of relaxations, |R|
+                        plus the light roads relaxed again within a bucket. It is all NumPy work, the Python loop only runs
+                        once for each round.
+        Space complexity:
+            Aux: O(|R| + |L|), for the NumPy arrays.
+        """
+        if np is None:
+            raise ImportError("delta_stepping needs numpy")
+        offsets = np.frombuffer(self.offsets, dtype=np.int64)
+        heads = np.frombuffer(self.targets, dtype=np.int32)
+        weights = np.frombuffer(self.weights, dtype=np.float64)
+        if delta is None:
+            delta = float(weights.mean()) if len(weights) else 1.0
+            if delta <= 0:
+                delta = 1.0
+        elif delta <= 0:
+            raise ValueError("delta must be a positive time")
+        light, heavy = self.delta_split(delta, offsets, weights)       # O(|R| + |L|), once for each delta
+
+        amount = self.amount_locations
+        dist = np.full(amount, inf)
+        pred = np.full(amount, -1, dtype=np.int64)
+        settled = np.zeros(amount, dtype=bool)
+        dist[s] = 0
+
+        while True:
+            waiting = np.flatnonzero(~settled & (dist < inf))          # reached but not settled
+            if len(waiting) == 0:
+                break
+            upper = (np.floor(dist[waiting].min() / delta) + 1) * delta    # the end of the lowest bucket in use
+            frontier = waiting[dist[waiting] < upper]
+            bucket = [frontier]
+            while len(frontier):                                        # light roads until the bucket stops changing
+                roads, sources = csr_roads(light[0], frontier)
+                changed = relax_batch(dist, pred, sources, heads[light[1][roads]],
+                                      dist[sources] + weights[light[1][roads]])
+                frontier = changed[dist[changed] < upper]
+                bucket.append(frontier)
+            bucket = np.unique(np.concatenate(bucket))
+            settled[bucket] = True
+            roads, sources = csr_roads(heavy[0], bucket)                # heavy roads once, they leave the bucket
+            relax_batch(dist, pred, sources, heads[heavy[1][roads]], dist[sources] + weights[heavy[1][roads]])
+
+        epoch = self.new_epoch()                                        # O(1)
+        reached = np.flatnonzero(dist < inf)
+        np.frombuffer(self.time_from_start, dtype=np.float64)[reached] = dist[reached]
+        np.frombuffer(self.previous, dtype=np.int32)[reached] = pred[reached]
+        np.frombuffer(self.discovered, dtype=np.uint32)[reached] = epoch
+        np.frombuffer(self.visited, dtype=np.uint32)[reached] = epoch
+        self.complete = True                                            # every location reachable from s is visited
+
+    def delta_split(self, delta, offsets, weights):
+        """
+        This function splits the roads of the graph into light roads, no longer than delta, and heavy roads, each as a
+        CSR pair (offsets, road indices) pointing into targets and weights. The split is kept in delta_roads and reused
+        until delta or the version of the graph changes.
+
+        Input:
+            delta: the bucket width.
+            offsets, weights: the CSR offsets and road times as NumPy arrays.
+        Return:
+            light, heavy: the two (offsets, road indices) pairs.
+        Time complexity:
+            best: O(1), when the split is reused.
+            worst: O(|R| + |L|)
+        Space complexity:
+            Aux: O(|R| + |L|)
+        """
+        if self.delta_roads is not None and self.delta_roads[0] == delta and self.delta_roads[1] == self.version:
+            return self.delta_roads[2], self.delta_roads[3]
+        starts = np.repeat(np.arange(self.amount_locations), np.diff(offsets))    # start location of every road
+        split = []
+        for chosen in (weights <= delta, weights > delta):
+            roads = np.flatnonzero(chosen)
+            split.append((np.searchsorted(starts[roads], np.arange(self.amount_locations + 1)), roads))
+        self.delta_roads = (delta, self.version, split[0], split[1])
+        return split[0], split[1]
+
+    def change_road(self, road, time):
+        """
+        Function description: This function changes the travel time of one road, and if the last search was a full
+                                dijkstra, repairs its result so get_time and path stay exact without searching again.
+
+        Approach description: The road is found through positions and r_positions and its time is changed in both directions.
+                                Let the road go from u to v.
+
+                                If the road got faster and now gives v a shorter time, v gets the new time and u as previous,
+                                and a dijkstra started from v alone spreads the shorter times to the locations after v.
+                                Only locations whose time goes down are served.
+
+                                If the road got slower and it is the road v was reached by (previous[v] is u), v and every
+                                location reached through v, the subtree of v found by following the previous array from
+                                the roads out of each location, may get slower. Their times are cleared, each of them
+                                takes the best time offered by a road from a location outside the subtree (found on the
+                                reversed roads), and a dijkstra limited to the subtree settles the rest. Locations of the
+                                subtree that are not reached again become unreachable.
+
+                                If the road got slower but no location was reached through it, nothing changes.
+
+                                The search results are dropped instead if the last search stopped early or used bidirectional
+                                or astar, and version goes up so other users of the graph can tell the roads changed.
+
+        Input:
+            road: an int, the index of the road in the roads given to add_road_prep.
+            time: the new travel time of the road in this graph.
+        Time complexity:
+            best: O(1), when nothing has to be repaired.
+            worst: O(|R|log|L|), the repair is a dijkstra over the locations whose time changes and their roads, which is
+                    usually a small part of the graph.
+        Space complexity:
+            Aux: O(|L|), for the repair heap, made on the first repair and reused afterwards.
+        """
+        if self.queue_kind != 'heap' and (time < 0 or time != int(time)):
+            raise ValueError("the '" + self.queue_kind + "' queue needs every road time to be a non-negative integer")
+
+        position = self.positions[road]
+        old_time = self.weights[position]
+        start = self.r_targets[self.r_positions[road]]
+        end = self.targets[position]
+        self.weights[position] = time
+        self.r_weights[self.r_positions[road]] = time
+        self.version += 1
+        if self.queue_kind == 'bucket' and time >= getattr(self.heap, 'queue', self.heap).amount:     # the buckets must cover the longest road
+            self.heap = self.make_queue()
+            if self.b_heap is not None:
+                self.b_heap = self.make_queue()
+
+        if not self.complete:                                   # nothing to repair, drop the old results
+            self.new_epoch()
+            return
+        if time == old_time or self.visited[start] != self.epoch:  # start was not reached, neither is the road
+            return
+
+        if self.repair_heap is None:
+            self.repair_heap = MinHeap(self.amount_locations)  # O(|L|)
+            self.in_repair = bytearray(self.amount_locations)   # O(|L|)
+
+        if time < old_time:
+            if self.get_time(start) + time < self.get_time(end):
+                self.repair(end, self.get_time(start) + time, start)
+        elif self.previous[end] == start:
+            self.repair_subtree(end)
+
+    def repair(self, location, time, parent):
+        """
+        This function gives location a shorter time from start through parent, and spreads it to the locations after it
+        with a dijkstra that only serves locations whose time goes down. The result is exact if every other location
+        already had its shortest time, or an upper bound of it that is reached later in this dijkstra.
+
+        Input:
+            location: an int, the location that got a shorter time.
+            time: the shorter time.
+            parent: an int, the location before location on the shorter path.
+        Time complexity:
+            best/worst: O(k log|L|), where k is the number of roads out of the locations whose time goes down.
+        Space complexity:
+            Aux: O(1), the repair heap is reused.
+        """
+        heap = self.repair_heap
+        heap.clear()
+        self.offer(location, time, parent)
+        self.drain()
+
+    def offer(self, location, time, parent):
+        """
+        This function gives location the time and parent, marks it reached, and adds it to the repair heap or updates its
+        key there.
+
+        Time complexity:
+            best/worst: O(log|L|)
+        Space complexity:
+            Aux: O(1)
+        """
+        self.time_from_start[location] = time
+        self.previous[location] = parent
+        self.discovered[location] = self.epoch
+        self.visited[location] = self.epoch
+        if self.in_repair[location]:
+            self.repair_heap.update(location, time)
+        else:
+            self.in_repair[location] = True
+            self.repair_heap.add(location, time)
+
+    def drain(self):
+        """
+        This function serves the repair heap until it is empty, offering every shorter time it finds along the roads.
+
+        Time complexity:
+            best/worst: O(k log|L|), where k is the number of roads out of the served locations.
+        Space complexity:
+            Aux: O(1)
+        """
+        heap = self.repair_heap
+        in_repair = self.in_repair
+        offsets = self.offsets
+        heads = self.targets
+        weights = self.weights
+        time_from_start = self.time_from_start
+        visited = self.visited
+        epoch = self.epoch
+        while heap.length > 0:
+            current = heap.serve()
+            in_repair[current] = False
+            current_time = time_from_start[current]
+            for i in range(offsets[current], offsets[current + 1]):
+                des = heads[i]
+                des_time = current_time + weights[i]
+                if visited[des] != epoch or des_time < time_from_start[des]:
+                    self.offer(des, des_time, current)
+
+    def repair_subtree(self, root):
+        """
+        This function works out the time from start again for root and every location reached through root, after the
+        road into root got slower.
+
+        Input:
+            root: an int, the location whose road from previous got slower.
+        Time complexity:
+            best/worst: O(k log|L|), where k is the number of roads into and out of the subtree of root.
+        Space complexity:
+            Aux: O(s), for the list of locations in the subtree.
+        """
+        offsets = self.offsets
+        heads = self.targets
+        previous = self.previous
+        visited = self.visited
+        epoch = self.epoch
+
+        subtree = [root]                                        # the subtree of root, by the previous array
+        visited[root] = 0                                       # marks the subtree while it is collected
+        i = 0
+        while i < len(subtree):
+            current = subtree[i]
+            i += 1
+            for j in range(offsets[current], offsets[current + 1]):
+                des = heads[j]
+                if visited[des] == epoch and previous[des] == current:
+                    visited[des] = 0
+                    subtree.append(des)
+
+        # every location of the subtree is unreachable now, unless a road from outside the subtree reaches it
+        for location in subtree:
+            self.discovered[location] = 0
+            self.time_from_start[location] = inf
+            self.previous[location] = -1
+
+        self.repair_heap.clear()
+        r_offsets = self.r_offsets
+        r_heads = self.r_targets
+        r_weights = self.r_weights
+        time_from_start = self.time_from_start
+        for location in subtree:
+            best = inf
+            parent = -1
+            for j in range(r_offsets[location], r_offsets[location + 1]):
+                source = r_heads[j]
+                if visited[source] == epoch and time_from_start[source] + r_weights[j] < best:
+                    best = time_from_start[source] + r_weights[j]
+                    parent = source
+            if parent != -1:
+                self.offer(location, best, parent)
+        self.drain()
+
+    def bidirectional(self, s, t):
+        """
+        Function description: This is a function to find the shortest time from s to t by searching from both ends at the
+                                same time, a forward Dijkstra from s on the roads and a backward Dijkstra from t on the
+                                reversed roads.
+
+        Approach description: In every step the side whose heap has the smaller key serves a location and relaxes its roads,
+                                the forward side uses offsets/targets/weights and the backward side uses r_offsets/r_targets/r_weights,
+                                both made by add_road_prep. Whenever a road reaches a location that the other side has discovered,
+                                the two halves together form a path from s to t, and mu keeps the shortest of them. The search
+                                stops once the smallest keys of the two heaps add up to at least mu, any path not found yet has
+                                to pass a location that is not visited by either side and can not be shorter than mu.
+
+                                Afterwards the backward half of the best path is copied into previous and time_from_start, so
+                                path(t, ...) and get_time() work the same as after dijkstra(s). Only the locations visited by the
+                                forward search and the locations on the path are counted as reached.
+
+        Input:
+            s: an int representing the starting location.
+            t: an int representing the destination.
+        Return:
+            mu: the shortest time from s to t, inf if t can not be reached.
+        Time complexity:
+            Best: O(1), when s is t.
+            Worst: O(|R|log|L|), the same as dijkstra, but usually each side only visits the locations within about half of
+                    the shortest time.
+        Space complexity:
+            Aux: O(|L|), for the backward arrays and heap, made on the first call and reused afterwards.
+        """
+        epoch = self.new_epoch()                                # O(1), forget the previous search
+        if self.b_heap is None:                                 # O(|L|), first bidirectional search on this graph
+            self.b_time = array('d', [inf]) * self.amount_locations
+            self.b_next = array('i', [-1]) * self.amount_locations
+            self.b_discovered = array('I', bytes(4 * self.amount_locations))
+            self.b_visited = array('I', bytes(4 * self.amount_locations))
+            self.b_heap = self.make_queue()
+        elif epoch == 1:                                        # the epoch number restarted, clear the backward stamps too
+            self.b_discovered = array('I', bytes(4 * self.amount_locations))
+            self.b_visited = array('I', bytes(4 * self.amount_locations))
+
+        time_from_start = self.time_from_start
+        previous = self.previous
+        discovered = self.discovered
+        visited = self.visited
+        b_time = self.b_time
+        b_next = self.b_next
+        b_discovered = self.b_discovered
+        b_visited = self.b_visited
+
+        time_from_start[s] = 0
+        previous[s] = -1
+        discovered[s] = epoch
+        if s == t:
+            visited[s] = epoch
+            return 0
+
+        b_time[t] = 0
+        b_next[t] = -1
+        b_discovered[t] = epoch
+
+        heap = self.heap
+        heap.clear()
+        heap.add(s, 0)
+        b_heap = self.b_heap
+        b_heap.clear()
+        b_heap.add(t, 0)
+
+        mu = inf
+        meet_from = meet_to = -1        # the road meet_from -> meet_to joins the two halves of the best path
+        stats = self.stats
+
+        while heap.length > 0 and b_heap.length > 0:
+            forward_key = heap.min_key()
+            backward_key = b_heap.min_key()
+            if forward_key + backward_key >= mu:                # no path through an unvisited location can be shorter
+                break
+
+            if forward_key <= backward_key:                     # serve from the forward side
+                current = heap.serve()
+                visited[current] = epoch
+                current_time = time_from_start[current]
+                offsets = self.offsets
+                heads = self.targets
+                weights = self.weights
+                if stats is not None:
+                    stats.settled += 1
+                    stats.relaxations += offsets[current + 1] - offsets[current]
+
+                for i in range(offsets[current], offsets[current + 1]):
+                    des = heads[i]
+                    des_time = current_time + weights[i]
+
+                    if discovered[des] != epoch:
+                        discovered[des] = epoch
+                        time_from_start[des] = des_time
+                        previous[des] = current
+                        heap.add(des, des_time)
+                    elif visited[des] != epoch and time_from_start[des] > des_time:
+                        time_from_start[des] = des_time
+                        previous[des] = current
+                        heap.update(des, des_time)
+
+                    if b_discovered[des] == epoch and des_time + b_time[des] < mu:     # the two halves meet at des
+                        mu = des_time + b_time[des]
+                        meet_from = current
+                        meet_to = des
+
+            else:                                               # serve from the backward side
+                current = b_heap.serve()
+                b_visited[current] = epoch
+                current_time = b_time[current]
+                offsets = self.r_offsets
+                heads = self.r_targets
+                weights = self.r_weights
+                if stats is not None:
+                    stats.settled += 1
+                    stats.relaxations += offsets[current + 1] - offsets[current]
+
+                for i in range(offsets[current], offsets[current + 1]):
+                    des = heads[i]
+                    des_time = current_time + weights[i]
+
+                    if b_discovered[des] != epoch:
+                        b_discovered[des] = epoch
+                        b_time[des] = des_time
+                        b_next[des] = current
+                        b_heap.add(des, des_time)
+                    elif b_visited[des] != epoch and b_time[des] > des_time:
+                        b_time[des] = des_time
+                        b_next[des] = current
+                        b_heap.update(des, des_time)
+
+                    if discovered[des] == epoch and des_time + time_from_start[des] < mu:     # the two halves meet at des
+                        mu = des_time + time_from_start[des]
+                        meet_from = des
+                        meet_to = current
+
+        if mu == inf:
+            return inf
+
+        # meet_from may only be discovered by the forward side, its time is still exact as it lies on the shortest path
+        visited[meet_from] = epoch
+        # copy the backward half of the path into the forward arrays, from meet_to towards t
+        current = meet_from
+        des = meet_to
+        des_time = mu - b_time[des]
+        while des != -1:                                        # O(|L|)
+            time_from_start[des] = des_time
+            previous[des] = current
+            discovered[des] = epoch
+            visited[des] = epoch
+            current = des
+            des = b_next[current]
+            if des != -1:
+                des_time += b_time[current] - b_time[des]
+
+        return mu
+
+    def astar(self, s, targets, landmarks, bound=inf):
+        """
+        Function description: This is a function to find the shortest time from s to every location in targets with the A*
+                                algorithm, where the lower bounds from landmarks guide the search towards the targets.
+
+        Approach description: The same as dijkstra, except that the key of a location in the heap is its time from start plus
+                                a lower bound of its time to the closest target, see Landmarks.lower_bound(). The lower bound
+                                never overestimates and does not drop by more than the time of a road along any road, so
+                                a location served from the heap already has its shortest time from start, just like in
+                                dijkstra, but the locations away from the targets get a larger key and are served later or
+                                not at all. A location with an infinite lower bound can not reach any target and is never
+                                added to the heap.
+
+                                The search stops once every target is visited, or once the smallest key in the heap is at
+                                least bound, every target that is not visited yet is at least bound away after that.
+
+        Input:
+            s: an int representing the starting location of the graph.
+            targets: an iterable of location ids to find the shortest time to.
+            landmarks: a Landmarks object made for this graph.
+            bound: a time, stop once no target closer than bound is left. Default = inf.
+        Time complexity:
+            Worst: O(|R|(log|L| + k|T|)), where k is the number of landmarks and |T| the number of targets, the lower bound
+                    costs O(k|T|) for each discovered location. Usually far fewer locations than dijkstra are visited.
+        Space complexity:
+            Aux: O(|L|), for the array of lower bounds and a MinHeap, made on the first call and reused afterwards.
+        """
+        epoch = self.new_epoch()                                # O(1), forget the previous search
+        if self.estimate is None:
+            self.estimate = array('d', [inf]) * self.amount_locations     # O(|L|)
+            self.astar_heap = self.count(MinHeap(self.amount_locations))     # O(|L|)
+
+        offsets = self.offsets
+        heads = self.targets
+        weights = self.weights
+        time_from_start = self.time_from_start
+        previous = self.previous
+        discovered = self.discovered
+        visited = self.visited
+        estimate = self.estimate
+        remaining = set(targets)                                # O(|T|), the targets that are not visited yet
+        if not remaining:
+            return
+        target_rows = landmarks.rows(remaining)                 # O(k|T|)
+        lower_bound = landmarks.lower_bound
+        stats = self.stats
+
+        time_from_start[s] = 0
+        previous[s] = -1
+        discovered[s] = epoch
+        estimate[s] = lower_bound(s, target_rows)
+        heap = self.astar_heap
+        heap.clear()
+        if estimate[s] < inf:
+            heap.add(s, estimate[s])
+
+        while heap.length > 0:
+            if heap.min_key() >= bound:                         # every target left is at least bound away
+                return
+            current = heap.serve()
+            visited[current] = epoch
+
+            if current in remaining:
+                remaining.discard(current)
+                if not remaining:                               # all targets are visited
+                    return
+
+            current_time = time_from_start[current]
+            if stats is not None:
+                stats.settled += 1
+                stats.relaxations += offsets[current + 1] - offsets[current]
+            for i in range(offsets[current], offsets[current + 1]):
+                des = heads[i]
+                des_time = current_time + weights[i]
+
+                if discovered[des] != epoch:                    # if not discovered, find its lower bound and add to heap
+                    discovered[des] = epoch
+                    time_from_start[des] = des_time
+                    previous[des] = current
+                    estimate[des] = lower_bound(des, target_rows)     # O(k|T|)
+                    if estimate[des] < inf:
+                        heap.add(des, des_time + estimate[des])
+
+                elif visited[des] != epoch and time_from_start[des] > des_time:
+                    time_from_start[des] = des_time
+                    previous[des] = current
+                    if estimate[des] < inf:
+                        heap.update(des, des_time + estimate[des])
+
+    def path(self, end, carpool):
+        """
+        Function description: This is a function to return the path of the shortest path found by the Dijkstra algorithm. It searches through
+                                the previous array of the graph and make a path list out of it.
+
+        precondition: end is an integer representing the ending of a path and start != end.
+        post-condition: path will contain the locations for shortest path.
+
+        Approach description: Follow the previous array from end and append every location to the path list. Once it reaches
+                                a location with previous equal to -1, or a location the last search did not visit, the while
+                                loop exit and finishing finding the path. The list only grows to the length of the path, so the
+                                cost does not depend on the size of the graph.
+
+                              The carpool param indicate whether we are finding a path for travelling alone or travelling
+                               using carpool lane. It's also been used to deciding whether to revert the path or drop the first
+                               location of the path. Useful for combining of two paths in OptimumRoute().
+        Input:
+            end: an int representing the destination.
+            carpool: a boolean value, True if finding path for using carpool lane, False otherwise.
+        Return:
+            path[1:]: path for travelling from 'end' to the destination using carpool lane
+            path: path for travelling from the source to 'end' using only non-carpool lane, reversed.
+        Time complexity:
+            best/worst: O(k), where k is the number of locations on the path, at most |L|.
+        Space complexity:
+            O(k) for space complexity as the input is only an integer and a boolean value, and a path list is needed to store the path from start to end.
+            Aux: O(k), extra spaces needed for path. k is the number of locations on the path.
+
+        """
+        previous = self.previous
+        visited = self.visited
+        epoch = self.epoch
+        path = [end]
+
+        while visited[end] == epoch and previous[end] != -1:     # O(k)
+            end = previous[end]          # O(1)
+            path.append(end)             # O(1)
+
+        if carpool:
+            return path[1:]     # O(k)
+        else:
+            return reverse(path)      # O(k)
+
+
+def read_roads(roads):
+    """
+    Function description: This function reads the roads in a single pass into four flat arrays, one for each field,
+                            and finds the amount of locations on the way.
+
+    Approach description: roads can be any iterable, including a generator reading the roads lazily from a file, since
+                            it is only looped through once and never indexed or kept. Every field is appended to a growable
+                            array, which stores a road in 24 bytes instead of a tuple of four Python numbers. The amount of
+                            locations is one more than the largest id at either end of a road, a location that roads only
+                            leave from still gets its place in the graph.
+
+    Input:
+        roads: an iterable of roads (a, b, c, d), start, end, travel time alone and travel time with carpool.
+    Return:
+        amount_locations: an int, the number of locations, 0 if there are no roads.
+        starts: an array of the start of each road (a).
+        ends: an array of the end of each road (b).
+        alone_times: an array of the travel time alone of each road (c).
+        carpool_times: an array of the travel time with carpool of each road (d).
+    Time complexity:
+        best/worst: O(|R|), where |R| is the number of roads.
+    Space complexity:
+        Aux: O(|R|), for the four arrays.
+    """
+    starts = array('i')
+    ends = array('i')
+    alone_times = array('d')
+    carpool_times = array('d')
+    largest = -1
+    for a, b, c, d in roads:        # O(|R|)
+        starts.append(a)
+        ends.append(b)
+        alone_times.append(c)
+        carpool_times.append(d)
+        if a > largest:
+            largest = a
+        if b > largest:
+            largest = b
+    return largest + 1, starts, ends, alone_times, carpool_times
+
+
+def compress(amount_locations, starts, ends, times):
+    """
+    Function description: This function groups a list of roads by their start location into compressed sparse row form.
+
+    Approach description: A counting sort on the start location. The number of roads leaving each location is counted
+                            first, a prefix sum over the counts gives the offset where the roads of each location begin,
+                            then every road is written into its slot. The sort is stable, so the roads of a location keep
+                            the order they had in the input.
+
+    Input:
+        amount_locations: an int representing the amount of locations.
+        starts: an array of ints, the start location of each road.
+        ends: an array of ints, the end location of each road.
+        times: an array of travel times, the time taken for each road.
+    Return:
+        offsets: an array of size amount_locations + 1, the roads of location v are at index offsets[v] to offsets[v+1] - 1.
+        targets: an array of size |R|, the end location of each road after grouping.
+        weights: an array of size |R|, the travel time of each road after grouping.
+        positions: an array of size |R|, the index in targets and weights where the i-th road was written.
+    Time complexity:
+        best/worst: O(|R| + |L|), where |R| is the number of roads and |L| is the number of locations.
+    Space complexity:
+        Aux: O(|R| + |L|), for the four output arrays.
+    """
+    offsets = array('q', bytes(8 * (amount_locations + 1)))     # O(|L|)
+    for start in starts:            # O(|R|), count the roads leaving each location
+        offsets[start + 1] += 1
+
+    for i in range(amount_locations):   # O(|L|), prefix sum
+        offsets[i + 1] += offsets[i]
+
+    cursor = offsets[:-1]           # O(|L|), next free slot for each location
+    targets = array('i', bytes(4 * len(starts)))        # O(|R|)
+    weights = array('d', bytes(8 * len(starts)))        # O(|R|)
+    positions = array('q', bytes(8 * len(starts)))      # O(|R|)
+
+    for i in range(len(starts)):    # O(|R|)
+        slot = cursor[starts[i]]
+        targets[slot] = ends[i]
+        weights[slot] = times[i]
+        positions[i] = slot
+        cursor[starts[i]] = slot + 1
+
+    return offsets, targets, weights, positions
+
+
+def reverse(lst):
+    """
+    A function to reverse a list
+
+    Input:
+        lst: a list of item.
+    Return:
+        lst: a list that has been reversed.
+    Time complexity:
+        best/worst: O(n), where n is the number of items in the list.
+    Space complexity:
+        O(n) for space complexity, where n is the number of items in the list.
+        Aux: O(1), no additional space is needed.
+    """
+    m = len(lst) // 2   # O(1)
+    n = len(lst) - 1    # O(1)
+
+    for i in range(m):          # O(n/2)
+        lst[i], lst[n] = lst[n], lst[i]
+        n -= 1
+    return lst
+
+
+def share_arrays(arrays):
+    """
+    Function description: This function copies a list of arrays into one block of shared memory, so worker processes can
+                            read them without each getting its own copy.
+
+    Approach description: The arrays are written one after another, each starting at a multiple of 8 bytes so every
+                            array stays aligned for its type. The layout records the type code, byte offset and length of
+                            each array, which is all attach_arrays needs to find them again.
+
+    Input:
+        arrays: a list of arrays from the array module, or memoryviews cast to a type.
+    Return:
+        shm: the SharedMemory block, the caller has to close and unlink it once the workers are done.
+        layout: a list of (typecode, offset, length) tuples, one for each array.
+    Time complexity:
+        best/worst: O(B), where B is the total number of bytes of the arrays.
+    Space complexity:
+        Aux: O(B), for the shared block.
+    """
+    layout = []
+    size = 0
+    for arr in arrays:
+        layout.append((arr.typecode if isinstance(arr, array) else arr.format, size, len(arr)))
+        size += -(-arr.itemsize * len(arr) // 8) * 8        # round up to a multiple of 8
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 8))
+    for arr, (typecode, offset, length) in zip(arrays, layout):
+        shm.buf[offset:offset + arr.itemsize * length] = arr.tobytes()     # O(B)
+    return shm, layout
+
+
+def attach_arrays(name, layout):
+    """
+    This function opens a shared memory block made by share_arrays and returns views of the arrays in it, no data is
+    copied.
+
+    Input:
+        name: the name of the SharedMemory block.
+        layout: the layout returned by share_arrays.
+    Return:
+        shm: the opened block, which has to stay referenced as long as the views are used.
+        views: a list of memoryviews, one for each array, cast to the type of that array.
+    Time complexity:
+        best/worst: O(k), where k is the number of arrays.
+    Space complexity:
+        Aux: O(k)
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    views = []
+    for typecode, offset, length in layout:
+        size = array(typecode).itemsize
+        views.append(shm.buf[offset:offset + size * length].cast(typecode))
+    return shm, views
+
+
+# the graphs of a time_matrix worker process, set by matrix_worker_init
+worker_state = {}
+
+
+def matrix_worker_init(name, layout, queue_kind):
+    """
+    This function runs once in every worker process of RoutePlanner.time_matrix. It opens the shared road arrays and
+    makes the alone graph and the reversed carpool graph on top of them.
+
+    Input:
+        name: the name of the SharedMemory block.
+        layout: the layout of the block, the CSR arrays of the alone graph and then of the carpool graph.
+        queue_kind: the queue of the graphs, see Graph.set_queue.
+    Time complexity:
+        best/worst: O(|L|), for the per location state of the two graphs.
+    Space complexity:
+        Aux: O(|L|), the roads are shared.
+    """
+    shm, views = attach_arrays(name, layout)
+    worker_state['shm'] = shm
+    worker_state[False] = Graph.from_csr(*views[0:3])
+    worker_state[True] = Graph.from_csr(*views[3:6])
+    if queue_kind != 'heap':
+        worker_state[False].set_queue(queue_kind)
+        worker_state[True].set_queue(queue_kind)
+
+
+def tree_job(carpool, source, graphs=None):
+    """
+    This function runs a full dijkstra from source and returns the result as a ShortestPathTree, the work done for
+    RouteService in its worker pool.
+
+    Input:
+        carpool: a boolean value, True for the reversed carpool graph, False for the alone graph.
+        source: an int, the location to search from.
+        graphs: a dict with the two graphs under False and True. Default = None, the graphs of this worker process.
+    Return:
+        tree: the ShortestPathTree of the search.
+    Time complexity:
+        best/worst: O(|R|log|L|)
+    Space complexity:
+        Aux: O(|L|), for the tree.
+    """
+    graph = (graphs if graphs is not None else worker_state)[carpool]
+    graph.dijkstra(source)          # O(|R|log|L|)
+    return ShortestPathTree(graph, source)
+
+
+def csr_roads(offsets, locations):
+    """
+    This function gathers the roads of many locations at once from CSR offsets, in NumPy.
+
+    Input:
+        offsets: a NumPy array of CSR offsets.
+        locations: a NumPy array of location ids.
+    Return:
+        roads: the index of every road leaving the locations.
+        sources: the location each of those roads leaves from.
+    Time complexity:
+        best/worst: O(k + n), where k is the number of roads and n the number of locations.
+    Space complexity:
+        Aux: O(k + n)
+    """
+    firsts = offsets[locations]
+    counts = offsets[locations + 1] - firsts
+    ends = np.cumsum(counts)
+    roads = np.arange(ends[-1] if len(ends) else 0) + np.repeat(firsts - (ends - counts), counts)
+    return roads, np.repeat(locations, counts)
+
+
+def relax_batch(dist, pred, sources, heads, times):
+    """
+    This function relaxes many roads at once. For every end location only the road with the shortest time is kept, with
+    a sort by end location and time, and it replaces the time and parent of the location if it is shorter.
+
+    Input:
+        dist, pred: NumPy arrays of the time from start and the parent of every location, changed in place.
+        sources, heads, times: NumPy arrays of the start, end and time from start through each road.
+    Return:
+        changed: the locations whose time went down.
+    Time complexity:
+        best/worst: O(k log k), where k is the number of roads.
+    Space complexity:
+        Aux: O(k)
+    """
+    if len(heads) == 0:
+        return heads
+    order = np.lexsort((times, heads))
+    heads = heads[order]
+    first = np.empty(len(heads), dtype=bool)
+    first[0] = True
+    first[1:] = heads[1:] != heads[:-1]
+    order = order[first]
+    heads = heads[first]
+    times = times[order]
+    better = times < dist[heads]
+    changed = heads[better]
+    dist[changed] = times[better]
+    pred[changed] = sources[order[better]]
+    return changed
+
+
+def matrix_rows(carpool, sources, columns, graphs=None):
+    """
+    This function runs a full dijkstra from every source and returns the times to the columns.
+
+    Input:
+        carpool: a boolean value, True for the reversed carpool graph, False for the alone graph.
+        sources: a list of locations to search from.
+        columns: a list of locations to read the times of.
+        graphs: a dict with the two graphs under False and True. Default = None, the graphs of this worker process.
+    Return:
+        rows: a list with one list of times for each source, inf for the columns it can not reach.
+    Time complexity:
+        best/worst: O(|S|(|R|log|L| + |C|)), where |S| is the number of sources and |C| the number of columns.
+    Space complexity:
+        Aux: O(|S||C|), for the output.
+    """
+    graph = (graphs if graphs is not None else worker_state)[carpool]
+    rows = []
+    for source in sources:
+        graph.dijkstra(source)      # O(|R|log|L|)
+        rows.append([graph.get_time(column) for column in columns])     # O(|C|)
+    return rows
+
+
+class ShortestPathTree:
+    """
+    This is a class for keeping the result of a search after the graph moves on to the next one. It holds a copy of the
+    per location arrays of the graph, so get_time and path give the same answers the graph gave right after the search,
+    and it can be pickled to send it between processes.
+
+    Author: Lim Jun Yi
+    student_id: 32625510
+    Date: 2023/4/24
+    """
+
+    def __init__(self, graph, source):
+        """
+        This is the initialisation method for the ShortestPathTree class. Copy the result of the last search of graph.
+
+        Input:
+            graph: the Graph that just finished a search.
+            source: an int, the location the search started from.
+        Time complexity:
+            best/worst: O(|L|), three array copies.
+        Space complexity:
+            Aux: O(|L|), 16 bytes for each location.
+        """
+        self.source = source
+        self.time_from_start = graph.time_from_start[:]     # O(|L|)
+        self.previous = graph.previous[:]                   # O(|L|)
+        self.visited = graph.visited[:]                     # O(|L|)
+        self.epoch = graph.epoch
+
+    def get_time(self, location):
+        """
+        This function returns the time from source to location, inf if the search did not visit location, see
+        Graph.get_time.
+
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1)
+        """
+        if self.visited[location] != self.epoch:
+            return inf
+        return self.time_from_start[location]
+
+    def path(self, end, carpool):
+        """
+        This function returns the path from source to end in the same form as Graph.path.
+
+        Time complexity:
+            best/worst: O(k), where k is the number of locations on the path.
+        Space complexity:
+            Aux: O(k)
+        """
+        previous = self.previous
+        visited = self.visited
+        epoch = self.epoch
+        path = [end]
+        while visited[end] == epoch and previous[end] != -1:     # O(k)
+            end = previous[end]
+            path.append(end)
+        if carpool:
+            return path[1:]
+        return reverse(path)
+
+    def nbytes(self):
+        """
+        This function returns the memory used by the arrays of the tree, in bytes.
+
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1)
+        """
+        return sum(arr.itemsize * len(arr) for arr in (self.time_from_start, self.previous, self.visited))
+
+
+class TreeCache:
+    """
+    This is a class for a least recently used cache of ShortestPathTree objects within a memory budget, for traffic where
+    a few starts and ends come up again and again.
+
+    A tree is stored under (carpool, source, version), where version is the version of the graph it was searched on, so
+    a tree is never used after a road of its graph changed. RoutePlanner.update_road also clears the cache, so old trees
+    do not take up the budget.
+
+    Author: Lim Jun Yi
+    student_id: 32625510
+    Date: 2023/4/24
+    """
+
+    def __init__(self, budget):
+        """
+        This is the initialisation method for the TreeCache class.
+
+        Input:
+            budget: an int, the most bytes the arrays of the stored trees may use together.
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1)
+        """
+        self.budget = budget
+        self.used = 0                   # bytes used by the stored trees
+        self.trees = OrderedDict()      # least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        This function returns the tree stored under key and marks it as the most recently used, or None.
+
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1)
+        """
+        tree = self.trees.get(key)
+        if tree is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.trees.move_to_end(key)
+        return tree
+
+    def put(self, key, tree):
+        """
+        This function stores tree under key, removing the least recently used trees until it fits in the budget. A tree
+        larger than the whole budget is not stored.
+
+        Time complexity:
+            best/worst: O(1), amortised over the trees stored.
+        Space complexity:
+            Aux: O(1), besides the tree.
+        """
+        size = tree.nbytes()
+        if size > self.budget:
+            return
+        if key in self.trees:
+            self.used -= self.trees.pop(key).nbytes()
+        while self.used + size > self.budget:
+            self.used -= self.trees.popitem(last=False)[1].nbytes()
+            self.evictions += 1
+        self.trees[key] = tree
+        self.used += size
+
+    def clear(self):
+        """
+        This function removes every tree, the hit and miss counts are kept.
+
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1)
+        """
+        self.trees.clear()
+        self.used = 0
+
+    def stats(self):
+        """
+        This function returns the counts of the cache as a dict.
+
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1)
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'trees': len(self.trees),
+                'bytes': self.used, 'budget': self.budget}
+
+
+class Landmarks:
+    """
+    This is a class for the landmark tables used by the A* search in Graph.astar (ALT: A*, landmarks and the triangle
+    inequality). For a few chosen landmark locations it stores the shortest time from every landmark to every location
+    and from every location to every landmark. By the triangle inequality, for any landmark l and locations v and t,
+    time(v, t) >= time(l, t) - time(l, v) and time(v, t) >= time(v, l) - time(t, l), which gives a lower bound of the
+    time from v to t without searching.
+
+    The tables are two flat arrays of size |L| * k, the k values of location v start at index v * k, so one lower bound
+    only reads two short runs of each array. They can be written to a file with save() and read back with load().
+
+    Author: Lim Jun Yi
+    student_id: 32625510
+    Date: 2023/4/24
+    """
+
+    def __init__(self, graph, count=8):
+        """
+        This is the initialisation method for the Landmarks class. Pick the landmarks for graph and fill the two tables.
+
+        Approach description: The landmarks are picked by the farthest rule. The first landmark is the location furthest
+                                from location 0, every next landmark is the location whose round trip time to its closest
+                                landmark so far is the largest, so the landmarks end up spread around the edge of the map.
+                                A location that can not reach or be reached from the landmarks so far has an infinite round
+                                trip time and is picked first, which puts a landmark in every part of a disconnected map.
+                                For each landmark one dijkstra on the roads and one on the reversed roads fill its column of
+                                the two tables.
+
+        Input:
+            graph: a Graph object, with its roads added by add_road_prep.
+            count: an int, the number of landmarks. Default = 8
+        Time complexity:
+            best/worst: O(k|R|log|L|), two full dijkstra for each of the k landmarks.
+        Space complexity:
+            Aux: O(k|L|), for the two tables.
+        """
+        amount = graph.amount_locations
+        count = min(count, amount)
+        self.amount_locations = amount
+        self.count = count
+        self.landmarks = array('i')
+        self.from_landmark = array('d', [inf]) * (amount * count)      # time(landmark i, v) at v * count + i
+        self.to_landmark = array('d', [inf]) * (amount * count)        # time(v, landmark i) at v * count + i
+
+        graph.dijkstra(0)                                       # O(|R|log|L|)
+        landmark = 0
+        for v in range(amount):                                 # O(|L|), furthest location reached from 0
+            if graph.get_time(v) < inf and graph.get_time(v) > graph.get_time(landmark):
+                landmark = v
+
+        closest = array('d', [inf]) * amount                    # round trip time from each location to its closest landmark
+        for i in range(count):                                  # O(k)
+            self.landmarks.append(landmark)
+            graph.dijkstra(landmark)                            # O(|R|log|L|)
+            for v in range(amount):
+                self.from_landmark[v * count + i] = graph.get_time(v)
+            graph.dijkstra(landmark, reverse=True)              # O(|R|log|L|)
+            for v in range(amount):
+                self.to_landmark[v * count + i] = graph.get_time(v)
+                closest[v] = min(closest[v], self.from_landmark[v * count + i] + self.to_landmark[v * count + i])
+
+            landmark = -1                                       # the location furthest from all the landmarks so far
+            for v in range(amount):                             # O(|L|)
+                if closest[v] > 0 and (landmark == -1 or closest[v] > closest[landmark]):
+                    landmark = v
+            if landmark == -1:                                  # every location is a landmark already
+                break
+        self.count = len(self.landmarks)
+        if self.count < count:                                  # keep the tables dense if fewer landmarks were found
+            self.from_landmark = array('d', [self.from_landmark[v * count + i] for v in range(amount) for i in range(self.count)])
+            self.to_landmark = array('d', [self.to_landmark[v * count + i] for v in range(amount) for i in range(self.count)])
+
+    def rows(self, targets):
+        """
+        This function gathers the table values of the targets, so lower_bound does not have to read them again for every
+        location.
+
+        Input:
+            targets: an iterable of location ids.
+        Return:
+            a list with one tuple (from_landmark values, to_landmark values) for each target.
+        Time complexity:
+            best/worst: O(k|T|), where |T| is the number of targets.
+        Space complexity:
+            Aux: O(k|T|)
+        """
+        count = self.count
+        return [(self.from_landmark[t * count:(t + 1) * count], self.to_landmark[t * count:(t + 1) * count]) for t in targets]
+
+    def lower_bound(self, v, target_rows):
+        """
+        This function returns a lower bound of the time from v to the closest of the targets.
+
+        Approach description: For each target the bound is the largest of time(l, t) - time(l, v) and time(v, l) - time(t, l)
+                                over the landmarks l, and the bound for the targets is the smallest of those. If the table says
+                                t is reached from a landmark that does not reach v, or v reaches a landmark that t does not,
+                                v can not reach t and the difference is inf. Differences of two infinite times are nan, which
+                                is never larger than the bound so far and is skipped.
+
+        Input:
+            v: an int representing the location id.
+            target_rows: the output of rows() for the targets.
+        Return:
+            bound: the lower bound, 0 at the closest target and inf if v can not reach any of the targets.
+        Time complexity:
+            best/worst: O(k|T|), where k is the number of landmarks and |T| is the number of targets.
+        Space complexity:
+            Aux: O(1)
+        """
+        count = self.count
+        from_v = self.from_landmark[v * count:(v + 1) * count]
+        to_v = self.to_landmark[v * count:(v + 1) * count]
+        bound = inf
+        for from_t, to_t in target_rows:            # O(|T|)
+            best = 0
+            for i in range(count):                  # O(k)
+                difference = from_t[i] - from_v[i]
+                if difference > best:
+                    best = difference
+                difference = to_v[i] - to_t[i]
+                if difference > best:
+                    best = difference
+            if best < bound:
+                bound = best
+        return bound
+
+    def save(self, filename):
+        """
+        This function writes the landmark tables into a binary file, a short header with the number of locations and
+        landmarks, followed by the landmark ids and the two tables as raw arrays.
+
+        Input:
+            filename: the path of the file to write.
+        Time complexity:
+            best/worst: O(k|L|)
+        Space complexity:
+            Aux: O(1)
+        """
+        with open(filename, 'wb') as f:
+            array('q', [self.amount_locations, self.count]).tofile(f)
+            self.landmarks.tofile(f)
+            self.from_landmark.tofile(f)
+            self.to_landmark.tofile(f)
+
+    @staticmethod
+    def load(filename):
+        """
+        This function reads the landmark tables written by save().
+
+        Input:
+            filename: the path of the file to read.
+        Return:
+            landmarks: a Landmarks object with the tables from the file.
+        Time complexity:
+            best/worst: O(k|L|)
+        Space complexity:
+            Aux: O(k|L|), for the two tables.
+        """
+        landmarks = Landmarks.__new__(Landmarks)
+        with open(filename, 'rb') as f:
+            header = array('q')
+            header.fromfile(f, 2)
+            landmarks.amount_locations, landmarks.count = header
+            landmarks.landmarks = array('i')
+            landmarks.landmarks.fromfile(f, landmarks.count)
+            landmarks.from_landmark = array('d')
+            landmarks.from_landmark.fromfile(f, landmarks.amount_locations * landmarks.count)
+            landmarks.to_landmark = array('d')
+            landmarks.to_landmark.fromfile(f, landmarks.amount_locations * landmarks.count)
+        return landmarks
+
+
+class ContractionHierarchy:
+    """
+    This is a class for a contraction hierarchy over the roads of one Graph, an index that answers shortest time queries
+    with two small searches after a slow preprocessing.
+
+    The locations are contracted one by one in an order that keeps the graph small. Contracting a location v removes it
+    from the graph, and for every pair of roads u -> v -> w where u -> v -> w is the only shortest way from u to w that
+    is left, a shortcut u -> w with the time of both roads is added, remembering v as its middle location. The position
+    of a location in the contraction order is its rank. Every road and shortcut goes either up (to a higher rank) or
+    down, and a shortest path always exists that first only goes up and then only goes down. So a query searches upward
+    from the source on the up roads and upward from the destination on the reversed down roads, and the two searches
+    meet at the highest location of the path.
+
+    The hierarchy is stored by rank in compressed sparse row form, up_targets[up_offsets[r]:up_offsets[r+1]] are the
+    ranks reached by the up roads of rank r, and down_targets[down_offsets[r]:down_offsets[r+1]] are the ranks of the
+    locations whose down road ends at rank r, each with its time and middle rank (-1 for a road of the graph).
+
+    Author: Lim Jun Yi
+    student_id: 32625510
+    Date: 2023/4/24
+    """
+
+    def __init__(self, graph, witness_limit=50):
+        """
+        This is the initialisation method for the ContractionHierarchy class, it contracts every location of graph.
+
+        Approach description: The roads of graph are copied into a dictionary for each location, only keeping the fastest
+                                road between two locations. Every location gets a priority, the number of shortcuts its
+                                contraction would add minus the number of roads it removes, plus the number of its
+                                neighbours that are contracted already, which spreads the contraction over the map. The
+                                location with the smallest priority is served from a MinHeap, its priority is worked out
+                                again since its neighbours may have changed, and it is only contracted if it is still
+                                the smallest, otherwise it is added back with the new priority.
+
+                                Whether a shortcut u -> w is needed is decided by a witness search, a dijkstra from u that
+                                does not pass v and gives up after witness_limit locations or once it is further than the
+                                time through v. If it finds a path no slower than through v, the shortcut is not needed.
+                                Giving up early only adds shortcuts that are not needed, the query results stay correct.
+
+        Input:
+            graph: a Graph object, with its roads added by add_road_prep.
+            witness_limit: an int, the most locations a witness search may visit. Default = 50
+        Time complexity:
+            Worst: O(|L|^2 log|L|) in theory, on road networks the contraction is close to O((|L| + |R|) log|L|) times the
+                    cost of the witness searches, each bounded by witness_limit.
+        Space complexity:
+            Aux: O(|L| + |R| + S), where S is the number of shortcuts.
+        """
+        self.graph = graph
+        self.witness_limit = witness_limit
+        amount = graph.amount_locations
+        self.amount_locations = amount
+
+        # the graph left to contract, out_roads[u][w] = in_roads[w][u] = [time, middle location]
+        self.out_roads = [{} for _ in range(amount)]       # O(|L|)
+        self.in_roads = [{} for _ in range(amount)]        # O(|L|)
+        for u in range(amount):                             # O(|L| + |R|)
+            for i in range(graph.offsets[u], graph.offsets[u + 1]):
+                w = graph.targets[i]
+                time = graph.weights[i]
+                if w == u:
+                    continue
+                road = self.out_roads[u].get(w)
+                if road is None:
+                    road = [time, -1]
+                    self.out_roads[u][w] = road
+                    self.in_roads[w][u] = road
+                elif time < road[0]:
+                    road[0] = time
+
+        # state of the witness searches
+        self.witness_time = array('d', [inf]) * amount
+        self.witness_discovered = array('I', bytes(4 * amount))
+        self.witness_visited = array('I', bytes(4 * amount))
+        self.witness_epoch = 0
+        self.witness_heap = MinHeap(amount)
+
+        self.rank = array('i', [-1]) * amount
+        self.order = array('i')
+        self.up_offsets = array('q', [0])
+        self.up_targets = array('i')
+        self.up_weights = array('d')
+        self.up_middles = array('i')
+        self.down_offsets = array('q', [0])
+        self.down_targets = array('i')
+        self.down_weights = array('d')
+        self.down_middles = array('i')
+
+        contracted_neighbours = array('i', bytes(4 * amount))
+        queue = MinHeap(amount)
+        for v in range(amount):                             # O(|L|), the first priority of every location
+            queue.add(v, self.contract(v, False) - len(self.in_roads[v]) - len(self.out_roads[v]))
+
+        while queue.length > 0:
+            v = queue.serve()
+            priority = self.contract(v, False) - len(self.in_roads[v]) - len(self.out_roads[v]) + contracted_neighbours[v]
+            if queue.length > 0 and priority > queue.min_key():     # not the smallest anymore, try again later
+                queue.add(v, priority)
+                continue
+
+            self.rank[v] = len(self.order)
+            self.order.append(v)
+            # the roads left at v all go up from v, the ones out of v are up roads, the ones into v are down roads
+            for w, road in self.out_roads[v].items():
+                self.up_targets.append(w)
+                self.up_weights.append(road[0])
+                self.up_middles.append(road[1])
+            for u, road in self.in_roads[v].items():
+                self.down_targets.append(u)
+                self.down_weights.append(road[0])
+                self.down_middles.append(road[1])
+            self.up_offsets.append(len(self.up_targets))
+            self.down_offsets.append(len(self.down_targets))
+
+            self.contract(v, True)
+            for w in self.out_roads[v]:                     # remove v from the graph left to contract
+                del self.in_roads[w][v]
+                contracted_neighbours[w] += 1
+            for u in self.in_roads[v]:
+                del self.out_roads[u][v]
+                contracted_neighbours[u] += 1
+            self.out_roads[v] = None
+            self.in_roads[v] = None
+
+        # the locations were stored by id while their rank was not known yet
+        rank = self.rank
+        for i in range(len(self.up_targets)):
+            self.up_targets[i] = rank[self.up_targets[i]]
+            if self.up_middles[i] != -1:
+                self.up_middles[i] = rank[self.up_middles[i]]
+        for i in range(len(self.down_targets)):
+            self.down_targets[i] = rank[self.down_targets[i]]
+            if self.down_middles[i] != -1:
+                self.down_middles[i] = rank[self.down_middles[i]]
+        self.out_roads = None
+        self.in_roads = None
+        self.witness_time = self.witness_discovered = self.witness_visited = self.witness_heap = None
+
+        # state of the queries, indexed by rank
+        self.f_time = array('d', [inf]) * amount
+        self.f_parent = array('i', [-1]) * amount
+        self.f_discovered = array('I', bytes(4 * amount))
+        self.b_time = array('d', [inf]) * amount
+        self.b_parent = array('i', [-1]) * amount
+        self.b_discovered = array('I', bytes(4 * amount))
+        self.epoch = 0
+        self.f_heap = MinHeap(amount)
+        self.b_heap = MinHeap(amount)
+
+    def contract(self, v, apply):
+        """
+        This function finds the shortcuts needed to contract v, and adds them to the graph left to contract if apply is True.
+
+        Input:
+            v: an int, the location to contract.
+            apply: a boolean value, True to add the shortcuts, False to only count them.
+        Return:
+            count: the number of shortcuts needed.
+        Time complexity:
+            best/worst: O(d * witness_limit * log|L|), one witness search for each of the d roads into v.
+        Space complexity:
+            Aux: O(1)
+        """
+        in_roads = self.in_roads[v]
+        out_roads = self.out_roads[v]
+        if not in_roads or not out_roads:
+            return 0
+
+        longest_out = max(road[0] for road in out_roads.values())
+        count = 0
+        for u, in_road in in_roads.items():
+            self.witness_search(u, v, in_road[0] + longest_out, len(out_roads))
+            for w, out_road in out_roads.items():
+                if w == u:
+                    continue
+                through_v = in_road[0] + out_road[0]
+                if self.witness_discovered[w] == self.witness_epoch and self.witness_time[w] <= through_v:
+                    continue                                # a path without v is no slower
+                count += 1
+                if apply:
+                    road = self.out_roads[u].get(w)
+                    if road is None:
+                        road = [through_v, v]
+                        self.out_roads[u][w] = road
+                        self.in_roads[w][u] = road
+                    elif through_v < road[0]:
+                        road[0] = through_v
+                        road[1] = v
+        return count
+
+    def witness_search(self, source, avoid, limit, wanted):
+        """
+        This function is a dijkstra from source on the graph left to contract that does not pass avoid, and stops once it
+        is further than limit, has visited witness_limit locations, or has visited all the locations after avoid. witness_time
+        holds an upper bound of the time from source for every location discovered in this search.
+
+        Input:
+            source: an int, the location to search from.
+            avoid: an int, the location that is being contracted.
+            limit: a time, the search stops once the closest location left is further than this.
+            wanted: an int, the number of roads out of avoid.
+        Time complexity:
+            best/worst: O(witness_limit * d * log|L|), where d is the largest number of roads of a location.
+        Space complexity:
+            Aux: O(1), the arrays and heap are made once.
+        """
+        self.witness_epoch += 1
+        epoch = self.witness_epoch
+        witness_time = self.witness_time
+        discovered = self.witness_discovered
+        visited = self.witness_visited
+        heap = self.witness_heap
+        heap.clear()
+
+        witness_time[source] = 0
+        discovered[source] = epoch
+        heap.add(source, 0)
+        after_avoid = self.out_roads[avoid]
+        settled = 0
+        while heap.length > 0 and settled < self.witness_limit:
+            if heap.min_key() > limit:
+                return
+            current = heap.serve()
+            visited[current] = epoch
+            settled += 1
+            if current in after_avoid:
+                wanted -= 1
+                if wanted == 0:                             # the time to every location after avoid is final
+                    return
+            current_time = witness_time[current]
+            for des, road in self.out_roads[current].items():
+                if des == avoid:
+                    continue
+                des_time = current_time + road[0]
+                if discovered[des] != epoch:
+                    discovered[des] = epoch
+                    witness_time[des] = des_time
+                    heap.add(des, des_time)
+                elif visited[des] != epoch and des_time < witness_time[des]:
+                    witness_time[des] = des_time
+                    heap.update(des, des_time)
+
+    def query(self, s, t, bound=inf):
+        """
+        Function description: This function finds the shortest time and path from s to t with the hierarchy.
+
+        Approach description: A dijkstra upward from s on the up roads and a dijkstra upward from t on the down roads take
+                                turns, the one with the smaller key goes first. Every location served by one side that the
+                                other side has discovered joins a path from s to t, mu keeps the fastest. A side is done
+                                once its smallest key is at least mu, since any path it finds later is slower. The path is
+                                then the up roads from s to the meeting location and the down roads to t, and every shortcut
+                                on it is replaced by its two halves until only roads of the graph are left.
+
+        Input:
+            s: an int, the starting location.
+            t: an int, the destination.
+            bound: a time, the search stops once it can only find paths of at least this time. Default = inf
+        Return:
+            mu: the shortest time from s to t, inf if it can not be reached (or is not shorter than bound).
+            path: the list of locations from s to t, an empty list if t can not be reached.
+        Time complexity:
+            Worst: O(|L| + |R| + S) for the search, but on road networks the upward searches only visit a few hundred
+                    locations. Unpacking the path costs O(k) for a path of k roads.
+        Space complexity:
+            Aux: O(k), for the path, the search arrays are made once.
+        """
+        if s == t:
+            return 0, [s]
+        self.epoch += 1
+        epoch = self.epoch
+        f_time = self.f_time
+        f_parent = self.f_parent
+        f_discovered = self.f_discovered
+        b_time = self.b_time
+        b_parent = self.b_parent
+        b_discovered = self.b_discovered
+        f_heap = self.f_heap
+        b_heap = self.b_heap
+        f_heap.clear()
+        b_heap.clear()
+
+        source = self.rank[s]
+        target = self.rank[t]
+        f_time[source] = 0
+        f_parent[source] = -1
+        f_discovered[source] = epoch
+        f_heap.add(source, 0)
+        b_time[target] = 0
+        b_parent[target] = -1
+        b_discovered[target] = epoch
+        b_heap.add(target, 0)
+
+        mu = bound
+        meet = -1
+        while True:
+            forward_key = f_heap.min_key()
+            backward_key = b_heap.min_key()
+            if forward_key >= mu and backward_key >= mu:    # both sides are done
+                break
+
+            if forward_key <= backward_key:
+                current = f_heap.serve()
+                current_time = f_time[current]
+                if b_discovered[current] == epoch and current_time + b_time[current] < mu:
+                    mu = current_time + b_time[current]
+                    meet = current
+                offsets, heads, weights, time, parent, discovered, heap = \
+                    self.up_offsets, self.up_targets, self.up_weights, f_time, f_parent, f_discovered, f_heap
+            else:
+                current = b_heap.serve()
+                current_time = b_time[current]
+                if f_discovered[current] == epoch and current_time + f_time[current] < mu:
+                    mu = current_time + f_time[current]
+                    meet = current
+                offsets, heads, weights, time, parent, discovered, heap = \
+                    self.down_offsets, self.down_targets, self.down_weights, b_time, b_parent, b_discovered, b_heap
+
+            for i in range(offsets[current], offsets[current + 1]):
+                des = heads[i]
+                des_time = current_time + weights[i]
+                if discovered[des] != epoch:
+                    discovered[des] = epoch
+                    time[des] = des_time
+                    parent[des] = current
+                    heap.add(des, des_time)
+                elif des_time < time[des]:              # a served location can not get a smaller time, so des is still in the heap
+                    time[des] = des_time
+                    parent[des] = current
+                    heap.update(des, des_time)
+
+        if meet == -1:
+            return inf, []
+
+        # hierarchy roads from s up to the meeting location, then down to t
+        roads = []
+        current = meet
+        while f_parent[current] != -1:
+            roads.append((f_parent[current], current))
+            current = f_parent[current]
+        roads.reverse()
+        current = meet
+        while b_parent[current] != -1:
+            roads.append((current, b_parent[current]))
+            current = b_parent[current]
+
+        order = self.order
+        path = [s]
+        for start, end in roads:
+            for location in self.unpack(start, end):
+                path.append(order[location])
+        return mu, path
+
+    def find(self, start, end):
+        """
+        This function finds the hierarchy road start -> end (both ranks).
+
+        Return:
+            (time, middle) of the road, middle is -1 for a road of the graph.
+        Time complexity:
+            best/worst: O(d), where d is the number of hierarchy roads of the lower ranked location.
+        Space complexity:
+            Aux: O(1)
+        """
+        if start < end:
+            offsets, heads, weights, middles, owner, other = self.up_offsets, self.up_targets, self.up_weights, self.up_middles, start, end
+        else:
+            offsets, heads, weights, middles, owner, other = self.down_offsets, self.down_targets, self.down_weights, self.down_middles, end, start
+        for i in range(offsets[owner], offsets[owner + 1]):
+            if heads[i] == other:
+                return weights[i], middles[i]
+        return inf, -1
+
+    def unpack(self, start, end):
+        """
+        This function replaces the hierarchy road start -> end (both ranks) with the roads of the graph it stands for.
+
+        Approach description: A stack of roads still to unpack, a shortcut is replaced by its two halves with the first half
+                                on top, so the roads of the graph come out in order along the path.
+
+        Return:
+            locations: the ranks of the locations after start on the path, ending with end.
+        Time complexity:
+            best/worst: O(k * d), where k is the number of roads of the graph on the path.
+        Space complexity:
+            Aux: O(k)
+        """
+        locations = []
+        stack = [(start, end)]
+        while stack:
+            start, end = stack.pop()
+            middle = self.find(start, end)[1]
+            if middle == -1:
+                locations.append(end)
+            else:
+                stack.append((middle, end))
+                stack.append((start, middle))
+        return locations
+
+    def search(self, s, targets, bound=inf):
+        """
+        Function description: This function finds the shortest time and path from s to every location in targets, and
+                                writes them into the per location arrays of the graph, so Graph.get_time and Graph.path
+                                give the same answers as after Graph.dijkstra(s, targets, bound).
+
+        Approach description: One query for each target. The locations on the path are written from s onwards, previous of
+                                a location is only set if it is not already on the path to an earlier target, so the paths
+                                join into one tree of shortest paths from s.
+
+        Input:
+            s: an int, the starting location.
+            targets: an iterable of location ids.
+            bound: a time, targets that are at least this far are left unreached. Default = inf
+        Time complexity:
+            best/worst: O(|T|) queries, where |T| is the number of targets.
+        Space complexity:
+            Aux: O(k), for the longest path.
+        """
+        graph = self.graph
+        epoch = graph.new_epoch()
+        time_from_start = graph.time_from_start
+        previous = graph.previous
+        discovered = graph.discovered
+        visited = graph.visited
+        time_from_start[s] = 0
+        previous[s] = -1
+        discovered[s] = epoch
+        visited[s] = epoch
+
+        offsets = graph.offsets
+        heads = graph.targets
+        weights = graph.weights
+        for t in targets:
+            if visited[t] == epoch:
+                continue
+            mu, path = self.query(s, t, bound)
+            for i in range(1, len(path)):
+                current = path[i - 1]
+                des = path[i]
+                if visited[des] == epoch:
+                    continue
+                road_time = inf                              # the fastest road current -> des
+                for j in range(offsets[current], offsets[current + 1]):
+                    if heads[j] == des and weights[j] < road_time:
+                        road_time = weights[j]
+                time_from_start[des] = time_from_start[current] + road_time
+                previous[des] = current
+                discovered[des] = epoch
+                visited[des] = epoch
+
+
+class RoutePlanner:
+    """
+    This is a class for answering many optimalRoute queries on the same roads. The graph for travelling alone and the
+    reversed graph for travelling with carpool are built once in __init__, afterwards every query only pays for its two
+    Dijkstra searches and the path reconstruction.
+
+    Author: Lim Jun Yi
+    student_id: 32625510
+    Date: 2023/4/24
+    """
+
+    def __init__(self, roads, queue='heap', stats=None):
+        """
+        This is the initialisation method for the RoutePlanner class. Build the two graphs from roads.
+
+        The roads are read once, see read_roads(), so roads can be a generator and is never copied as a list.
+
+        Input:
+            roads: an iterable of tuples where each tuple represented a road. The tuple included the start(a),
+                        end(b), travel time for alone(c) and travelling time for carpool(d). (a, b, c, d)
+            queue: the priority queue of both graphs, 'heap', 'bucket' or 'radix', see Graph.set_queue. Default = 'heap'
+            stats: a RouteStats to collect the work of the planner in, see watch. Default = None
+        Time complexity:
+            best/worst: O(|R| + |L|), where |R| is the number of roads and |L| is the number of locations.
+        Space complexity:
+            Aux: O(|R| + |L|), for the arrays of the two graphs.
+        """
+        if stats is not None:
+            stats.start()
+        amount_locations, starts, ends, alone_times, carpool_times = read_roads(roads)  # O(|R|), Aux: O(|R|)
+        # make a graph consisted of all the locations for traveling alone and travelling with carpool
+        alone = Graph.empty(amount_locations)       # O(|L|)
+        carpool = Graph.empty(amount_locations)     # O(|L|)
+        # add the roads to each graph, the carpool graph has every road reversed
+        alone.set_roads(starts, ends, alone_times)          # O(|R| + |L|), Aux: O(|R| + |L|)
+        carpool.set_roads(ends, starts, carpool_times)      # O(|R| + |L|), Aux: O(|R| + |L|)
+        self.use_graphs(alone, carpool, queue)
+        if stats is not None:
+            self.watch(stats)
+            stats.lap('build')
+
+    def use_graphs(self, alone, carpool, queue):
+        """
+        This function sets up the planner around an alone graph and a reversed carpool graph, the rest of __init__ once
+        the graphs are built, also used by load.
+
+        Input:
+            alone: the Graph of the alone times.
+            carpool: the Graph of the carpool times with every road reversed.
+            queue: the priority queue of both graphs, see Graph.set_queue.
+        Time complexity:
+            best/worst: O(|R| + |L|), for set_queue.
+        Space complexity:
+            Aux: O(|L| + C), for the queues.
+        """
+        self.alone = alone
+        self.carpool = carpool
+        if queue != 'heap':
+            self.alone.set_queue(queue)
+            self.carpool.set_queue(queue)
+        # the open file of a planner made by load, None if the roads are in memory
+        self.mapped = None
+        # the RouteStats of watch, None when not watched
+        self.stats = None
+        # landmark tables for the 'alt' engine, see prepare_landmarks
+        self.alone_landmarks = None
+        self.carpool_landmarks = None
+        # contraction hierarchies for the 'ch' engine, see prepare_hierarchies
+        self.alone_hierarchy = None
+        self.carpool_hierarchy = None
+        # graph of (location, carpool mode) states for the 'layered' engine, only made when it is first used
+        self.layered = None
+        # the TreeCache of use_cache, None when trees are not cached
+        self.cache = None
+        # bucket width of the 'delta' engine, None for the mean road time, see Graph.delta_stepping
+        self.delta = None
+
+    def use_cache(self, budget):
+        """
+        This function makes route keep the searches from starts and ends in a TreeCache of budget bytes, or stops caching
+        if budget is None. With the cache, every search is a full dijkstra, slower than the early stopping searches on a
+        miss but reusable by every later query with the same start or end. A tree takes 16 bytes for each location.
+
+        Input:
+            budget: an int, the memory budget in bytes, or None.
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1), the trees are added by route.
+        """
+        self.cache = TreeCache(budget) if budget is not None else None
+
+    def tree(self, carpool, source):
+        """
+        This function returns the ShortestPathTree of a full dijkstra from source, from the cache when it is there.
+
+        Input:
+            carpool: a boolean value, True for the reversed carpool graph, False for the alone graph.
+            source: an int, the location to search from.
+        Return:
+            the ShortestPathTree.
+        Time complexity:
+            best: O(1), on a hit.
+            worst: O(|R|log|L|), on a miss.
+        Space complexity:
+            Aux: O(|L|), for a new tree.
+        """
+        graph = self.carpool if carpool else self.alone
+        key = (carpool, source, graph.version)
+        tree = self.cache.get(key)
+        if tree is None:
+            graph.dijkstra(source)                      # O(|R|log|L|)
+            tree = ShortestPathTree(graph, source)      # O(|L|)
+            self.cache.put(key, tree)
+        return tree
+
+    def watch(self, stats):
+        """
+        This function starts collecting counters and phase times of every later route call in stats, or stops if stats
+        is None. Without stats the planner only checks for None once in each phase and each search once for every served
+        location.
+
+        Input:
+            stats: a RouteStats, or None.
+        Time complexity:
+            best/worst: O(1)
+        Space complexity:
+            Aux: O(1)
+        """
+        self.stats = stats
+        self.alone.watch(stats)
+        self.carpool.watch(stats)
+        if self.layered is not None:
+            self.layered.watch(stats)
+
+    def prepare_landmarks(self, count=8):
+        """
+        This function builds the landmark tables of the two graphs, which the 'alt' engine of route needs. The tables can
+        also be saved with Landmarks.save and given back to a later planner on the same roads by setting alone_landmarks
+        and carpool_landmarks to the result of Landmarks.load.
+
+        Input:
+            count: an int, the number of landmarks for each graph. Default = 8
+        Time complexity:
+            best/worst: O(k|R|log|L|), see Landmarks.
+        Space complexity:
+            Aux: O(k|L|), for the tables.
+        """
+        self.alone_landmarks = Landmarks(self.alone, count)
+        self.carpool_landmarks = Landmarks(self.carpool, count)
+
+    def update_road(self, road, alone_time=None, carpool_time=None):
+        """
+        This function changes the travel times of one road, for example from live traffic. Later calls to route use the new
+        times and stay exact.
+
+        The landmark tables and contraction hierarchies were made for the old times and are dropped, since their bounds
+        and shortcuts may be wrong now. Call prepare_landmarks or prepare_hierarchies again after a batch of updates to use
+        the 'alt' or 'ch' engine.
+
+        Input:
+            road: an int, the index of the road in the roads given to __init__.
+            alone_time: the new travel time for travelling alone (c), None to keep it.
+            carpool_time: the new travel time for travelling with carpool (d), None to keep it.
+        Time complexity:
+            see Graph.change_road.
+        Space complexity:
+            Aux: O(1)
+        """
+        if self.mapped is not None:
+            raise ValueError("the roads of a planner made by RoutePlanner.load can not be changed")
+        if alone_time is not None:
+            self.alone.change_road(road, alone_time)
+        if carpool_time is not None:
+            self.carpool.change_road(road, carpool_time)
+        self.alone_landmarks = self.carpool_landmarks = None
+        self.alone_hierarchy = self.carpool_hierarchy = None
+        self.layered = None
+        if self.cache is not None:
+            self.cache.clear()
+
+    def save(self, filename):
+        """
+        Function description: This function writes the roads of both graphs into a binary file, which load can map into
+                                memory without building anything.
+
+        Approach description: The file is a header of three 64 bit ints, GRAPH_MAGIC, the number of locations and the
+                                number of roads, followed by the CSR arrays of the graphs as raw native arrays. The carpool
+                                graph has the same roads as the alone graph in the other direction, so its offsets and targets
+                                are the reversed ones of the alone graph and only its times are written. The 64 bit arrays
+                                come first and the 32 bit targets last, so every array starts aligned for its type:
+
+                                offsets, r_offsets                                      (|L| + 1 int64 each)
+                                alone weights, alone r_weights,
+                                carpool weights, carpool r_weights                      (|R| float64 each)
+                                targets, r_targets                                      (|R| int32 each)
+
+        Input:
+            filename: the path of the file to write.
+        Time complexity:
+            best/worst: O(|R| + |L|)
+        Space complexity:
+            Aux: O(1), the arrays are written as they are.
+        """
+        alone = self.alone
+        carpool = self.carpool
+        with open(filename, 'wb') as f:
+            array('q', [GRAPH_MAGIC, alone.amount_locations, len(alone.targets)]).tofile(f)
+            for arr in (alone.offsets, alone.r_offsets, alone.weights, alone.r_weights,
+                        carpool.weights, carpool.r_weights, alone.targets, alone.r_targets):
+                f.write(arr)        # O(|R| + |L|), works for arrays and memoryviews of a loaded planner
+
+    @staticmethod
+    def load(filename, queue='heap'):
+        """
+        Function description: This function makes a planner from a file written by save, without reading the roads.
+
+        Approach description: The file is mapped into memory read only and every array of the graphs is a memoryview
+                                over its part of the mapping, see Graph.from_csr, so nothing is copied or parsed. Only the
+                                pages a search touches are read from disk, and processes loading the same file share those
+                                pages through the page cache. Only the per location search state is allocated.
+
+                              The roads of the planner are read only, update_road raises a ValueError.
+
+        Input:
+            filename: the path of a file written by save on a machine with the same byte order.
+            queue: the priority queue of both graphs, see Graph.set_queue. Default = 'heap'
+        Return:
+            planner: a RoutePlanner over the roads in the file.
+        Time complexity:
+            best/worst: O(|L|), for the per location state, O(|R| + |L|) with a queue other than 'heap'.
+        Space complexity:
+            Aux: O(|L|), the roads stay in the file.
+        """
+        with open(filename, 'rb') as f:
+            mapped = mmap(f.fileno(), 0, access=ACCESS_READ)    # the mapping stays valid after the file is closed
+        view = memoryview(mapped)
+        magic, amount_locations, amount_roads = view[0:24].cast('q')
+        if magic != GRAPH_MAGIC:
+            raise ValueError(repr(filename) + " is not a road graph file written by RoutePlanner.save")
+
+        arrays = []
+        offset = 24
+        for typecode, length in (('q', amount_locations + 1), ('q', amount_locations + 1), ('d', amount_roads),
+                                 ('d', amount_roads), ('d', amount_roads), ('d', amount_roads),
+                                 ('i', amount_roads), ('i', amount_roads)):
+            size = array(typecode).itemsize * length
+            arrays.append(view[offset:offset + size].cast(typecode))
+            offset += size
+        offsets, r_offsets, weights, r_weights, c_weights, c_r_weights, targets, r_targets = arrays
+
+        alone = Graph.from_csr(offsets, targets, weights, r_offsets, r_targets, r_weights)         # O(|L|)
+        carpool = Graph.from_csr(r_offsets, r_targets, c_weights, offsets, targets, c_r_weights)   # O(|L|)
+        planner = RoutePlanner.__new__(RoutePlanner)
+        planner.use_graphs(alone, carpool, queue)
+        planner.mapped = mapped
+        return planner
+
+    def prepare_hierarchies(self, witness_limit=50):
+        """
+        This function builds the contraction hierarchies of the two graphs, one over the alone times and one over the
+        carpool times, which the 'ch' engine of route needs.
+
+        Input:
+            witness_limit: an int, see ContractionHierarchy. Default = 50
+        Time complexity:
+            see ContractionHierarchy.
+        Space complexity:
+            Aux: O(|L| + |R| + S), where S is the number of shortcuts.
+        """
+        self.alone_hierarchy = ContractionHierarchy(self.alone, witness_limit)
+        self.carpool_hierarchy = ContractionHierarchy(self.carpool, witness_limit)
+
+    def search(self, carpool, source, targets, bound, engine):
+        """
+        This function runs the search selected by engine on one of the two graphs. Every engine leaves its results in the
+        per location arrays of the graph, ready for get_time and path.
+
+        Input:
+            carpool: a boolean value, True to search the carpool graph, False for the alone graph.
+            source: an int, the location to search from.
+            targets: a list of location ids to find the shortest time to.
+            bound: a time, the search may stop once no target closer than bound is left.
+            engine: 'dijkstra', 'alt', 'ch' or 'delta'.
+        Time complexity:
+            see Graph.dijkstra, Graph.astar and ContractionHierarchy.search.
+        Space complexity:
+            Aux: O(|T|), where |T| is the number of targets.
+        """
+        graph = self.carpool if carpool else self.alone
+        if engine == 'dijkstra':
+            graph.dijkstra(source, targets, bound)
+        elif engine == 'alt':
+            landmarks = self.carpool_landmarks if carpool else self.alone_landmarks
+            if landmarks is None:
+                raise ValueError("the 'alt' engine needs prepare_landmarks() to be called first")
+            graph.astar(source, targets, landmarks, bound)
+        elif engine == 'ch':
+            hierarchy = self.carpool_hierarchy if carpool else self.alone_hierarchy
+            if hierarchy is None:
+                raise ValueError("the 'ch' engine needs prepare_hierarchies() to be called first")
+            hierarchy.search(source, targets, bound)
+        elif engine == 'delta':
+            graph.delta_stepping(source, self.delta)
+        else:
+            raise ValueError("unknown route engine: " + repr(engine))
+
+    def make_layered(self):
+        """
+        Function description: This function makes the graph of (location, carpool mode) states used by layered_route.
+
+        Approach description: State v is location v travelled alone and state v + |L| is location v travelled with a
+                                passenger. The roads of the alone states are the roads of the alone graph, the roads of the
+                                carpool states are the carpool roads in their real direction, which the carpool graph already
+                                keeps as its reversed roads, moved up by |L|. The two CSR arrays are put one after the
+                                other, and the roads between the layers are added by each search, see Graph.dijkstra.
+
+        Return:
+            layered: a Graph over 2|L| states.
+        Time complexity:
+            best/worst: O(|R| + |L|)
+        Space complexity:
+            Aux: O(|R| + |L|)
+        """
+        alone = self.alone
+        carpool = self.carpool
+        amount = alone.amount_locations
+        amount_roads = len(alone.targets)
+
+        offsets = array('q', alone.offsets)                                         # O(|L|)
+        offsets.extend(amount_roads + carpool.r_offsets[i] for i in range(1, amount + 1))   # O(|L|)
+        targets = array('i', alone.targets)                                         # O(|R|)
+        targets.extend(t + amount for t in carpool.r_targets)                       # O(|R|)
+        weights = array('d', alone.weights)                                         # O(|R|)
+        weights.extend(carpool.r_weights)                                           # O(|R|)
+
+        layered = Graph.from_csr(offsets, targets, weights)
+        if alone.queue_kind != 'heap':
+            layered.set_queue(alone.queue_kind)
+        layered.watch(self.stats)
+        return layered
+
+    def layered_route(self, start, end, passengers):
+        """
+        Function description: This function finds the fastest route from start to end with one search, picking up at
+                                whichever passenger location is best.
+
+        Approach description: The search runs on the graph of (location, carpool mode) states, see make_layered, from the
+                                alone state of start. Every passenger location gets a road with no travel time from its alone
+                                state to its carpool state, so the search itself decides where switching to the carpool lane
+                                pays off, and no reverse search from end is needed. end gets the same road, so the carpool
+                                state of end is reached in the best of the two times and it is the only target.
+
+                              The path over states is turned back into locations by taking each state modulo |L| and
+                                dropping the repeated location where the layers switch.
+
+        Input:
+            start: an int, departure location.
+            end: an int, destination location.
+            passengers: a list locations where there are potential passengers.
+        Return:
+            the fastest path from start to end, the same time as route, the same path unless two routes are equally fast.
+        Time complexity:
+            best/worst: O(|R|log|L|), one dijkstra on a graph twice the size.
+        Space complexity:
+            Aux: O(|L| + |P|), for the switches and the path.
+        """
+        if self.layered is None:
+            self.layered = self.make_layered()          # O(|R| + |L|), once
+        layered = self.layered
+        amount = self.alone.amount_locations
+
+        switches = {p: p + amount for p in passengers}  # O(|P|)
+        switches[end] = end + amount
+        layered.dijkstra(start, [end + amount], switches=switches)     # O(|R|log|L|)
+        if layered.get_time(end + amount) == inf:
+            return [end]
+
+        path = []
+        for state in layered.path(end + amount, False):         # O(|L|)
+            location = state % amount
+            if not path or path[-1] != location:
+                path.append(location)
+        return path
+
+    def pickup_report(self, start, end, passengers):
+        """
+        This function returns the best route for every passenger location at once, for showing the choices, with one
+        search on each graph instead of one for each passenger. The search from start gives the alone part and the search
+        on the reversed carpool graph from end gives the carpool part of every route.
+
+        Input:
+            start: an int, departure location.
+            end: an int, destination location.
+            passengers: a list locations where there are potential passengers.
+        Return:
+            report: a dict from passenger location to (time, path), the fastest route from start to end that picks up
+                    there, time is inf and path is None when it can not be done.
+        Time complexity:
+            best/worst: O(|R|log|L| + |P||L|), for the two dijkstra and the paths.
+        Space complexity:
+            Aux: O(|P||L|), for the paths.
+        """
+        alone = self.alone
+        carpool = self.carpool
+        alone.dijkstra(start, passengers)           # O(|R|log|L|)
+        carpool.dijkstra(end, passengers)           # O(|R|log|L|)
+        report = {}
+        for p in passengers:                        # O(|P|)
+            time = alone.get_time(p) + carpool.get_time(p)
+            if time == inf:
+                report[p] = (inf, None)
+            else:
+                report[p] = (time, alone.path(p, False) + carpool.path(p, True))    # O(|L|)
+        return report
+
+    def passenger_pickup(self, p_location, end, alone=None, carpool=None):
+        """
+        This function to find the best place to pick up the passenger.
+
+        Input:
+            p_location: a list locations where there are potential passengers.
+            end: an int presenting the destination location
+            alone: the search from start to use, a Graph or ShortestPathTree. Default = None, the alone graph.
+            carpool: the reversed carpool search from end to use. Default = None, the carpool graph.
+        Return:
+            pick_up: the location to pick up the passenger, None if all passenger location slow you down.
+        Time complexity:
+            best/worst: O(|P|), where |P| is the number of locations where there are potential passengers.
+        Space complexity:
+            The space complexity is O(P) where P is the numbers of locations with passenger.
+            Aux: O(1), no additional space is needed
+        """
+        if alone is None:
+            alone = self.alone
+        if carpool is None:
+            carpool = self.carpool
+        comb_time = alone.get_time(end)    # use the shortest time for travelling along as base case
+        pick_up = None
+        for p in p_location:    # O(|P|)
+            if alone.get_time(p) + carpool.get_time(p) < comb_time:
+                comb_time = alone.get_time(p) + carpool.get_time(p)   # O(1)
+                pick_up = p     # O(1)
+        return pick_up
+
+    def time_matrix(self, starts, ends, passengers, workers=None):
+        """
+        Function description: This function answers every combination of a start in starts and an end in ends at once,
+                                with the fastest time and the passenger location to pick up, the same choice as route.
+
+        Approach description: The passenger_pickup comparison only needs, for every start, the alone time to every end and
+                                every passenger, and for every end, the carpool time from every passenger. So one full dijkstra
+                                is run from every distinct start on the alone graph, and one from every distinct end on the
+                                reversed carpool graph, instead of two searches for each pair.
+
+                              With workers, the searches are spread over a process pool. The road arrays of both graphs
+                                are copied once into shared memory, see share_arrays, and every worker builds its graphs on
+                                top of them, see matrix_worker_init, so the roads are not copied or pickled for each worker.
+
+                              For each start, the times through every passenger to every end are alone[p] + carpool[e][p],
+                                a |E| x |P| table. With numpy it is made and reduced in one vectorised step, the first
+                                passenger with the smallest time is the pickup, as in passenger_pickup, and it is only used
+                                when it is strictly faster than travelling alone.
+
+        Input:
+            starts: a list of departure locations.
+            ends: a list of destination locations.
+            passengers: a list of locations where there are potential passengers, shared by every combination.
+            workers: an int, the number of worker processes. Default = None, search in this process.
+        Return:
+            times: a list of lists, times[i][j] is the fastest time from starts[i] to ends[j], inf if ends[j] can not be reached.
+            pickups: a list of lists, pickups[i][j] is the passenger location to pick up on the way, None if it is not worth it.
+        Time complexity:
+            best/worst: O((|S| + |E|)|R|log|L| + |S||E||P|), where |S| and |E| are the number of distinct starts and ends,
+                        the searches are split between the workers.
+        Space complexity:
+            Aux: O((|S| + |E|)(|E| + |P|)), for the time tables, and O(|R| + |L|) of shared memory with workers.
+        """
+        passengers = list(passengers)
+        sources = list(dict.fromkeys(starts))       # distinct starts, in order
+        sinks = list(dict.fromkeys(ends))           # distinct ends, in order
+        columns = sinks + passengers                # the alone times needed from each start
+
+        if not workers:
+            graphs = {False: self.alone, True: self.carpool}
+            alone_rows = matrix_rows(False, sources, columns, graphs)          # O(|S||R|log|L|)
+            carpool_rows = matrix_rows(True, sinks, passengers, graphs)        # O(|E||R|log|L|)
+        else:
+            shm, layout = share_arrays([self.alone.offsets, self.alone.targets, self.alone.weights,
+                                        self.carpool.offsets, self.carpool.targets, self.carpool.weights])  # O(|R| + |L|)
+            try:
+                with ProcessPoolExecutor(workers, initializer=matrix_worker_init,
+                                         initargs=(shm.name, layout, self.alone.queue_kind)) as pool:
+                    alone_jobs = [pool.submit(matrix_rows, False, sources[i::workers], columns) for i in range(workers)]
+                    carpool_jobs = [pool.submit(matrix_rows, True, sinks[i::workers], passengers) for i in range(workers)]
+                    alone_rows = [None] * len(sources)
+                    carpool_rows = [None] * len(sinks)
+                    for i in range(workers):        # put the strided rows back in order
+                        alone_rows[i::workers] = alone_jobs[i].result()
+                        carpool_rows[i::workers] = carpool_jobs[i].result()
+            finally:
+                shm.close()
+                shm.unlink()
+
+        amount_ends = len(sinks)
+        best = {}
+        if np is not None:
+            carpool_table = np.array(carpool_rows, dtype=float).reshape(amount_ends, len(passengers))   # |E| x |P|
+            for source, row in zip(sources, alone_rows):
+                row = np.array(row, dtype=float)
+                alone_end = row[:amount_ends]
+                comb = row[amount_ends:] + carpool_table            # O(|E||P|), alone[p] + carpool[e][p]
+                if passengers:
+                    choice = comb.argmin(axis=1)
+                    comb_time = comb[np.arange(amount_ends), choice]
+                else:
+                    choice = np.zeros(amount_ends, dtype=int)
+                    comb_time = np.full(amount_ends, inf)
+                faster = comb_time < alone_end
+                for j, end in enumerate(sinks):
+                    if faster[j]:
+                        best[source, end] = (float(comb_time[j]), passengers[choice[j]])
+                    else:
+                        best[source, end] = (float(alone_end[j]), None)
+        else:
+            for source, row in zip(sources, alone_rows):
+                for j, end in enumerate(sinks):
+                    comb_time = row[j]
+                    pick_up = None
+                    for k, p in enumerate(passengers):      # O(|P|), same comparison as passenger_pickup
+                        if row[amount_ends + k] + carpool_rows[j][k] < comb_time:
+                            comb_time = row[amount_ends + k] + carpool_rows[j][k]
+                            pick_up = p
+                    best[source, end] = (comb_time, pick_up)
+
+        times = [[best[start, end][0] for end in ends] for start in starts]
+        pickups = [[best[start, end][1] for end in ends] for start in starts]
+        return times, pickups
+
+    def route(self, start, end, passengers, engine='dijkstra'):
+        """
+        Function description: This function is used to find the fastest route between start and end on the roads given to
+                                __init__, see optimalRoute() for the approach.
+
+        Approach description: Both searches stop early. The search from start stops once end and every passenger location
+                                are visited. A passenger is only worth picking up if reaching it alone is already faster than
+                                the best time for travelling alone, so the reversed carpool search from end only looks for those
+                                passengers, and stops once it is further than the best time for travelling alone minus the time
+                                to the closest of them, after that no passenger can be picked up in time. If no passenger is
+                                worth it, the carpool search is skipped.
+
+                              Without passengers the answer is a single path from start to end, so a bidirectional search
+                                is used instead, see Graph.bidirectional().
+
+                              With the 'alt' engine both searches use A* with the landmark tables instead of dijkstra, see
+                                Graph.astar(), which gives the same times and visits far fewer locations on large maps.
+                                With the 'ch' engine every time is a query on the contraction hierarchies, see
+                                ContractionHierarchy.search().
+
+                              The 'delta' engine runs Graph.delta_stepping() with the bucket width in delta instead, a full
+                                search in NumPy.
+
+                              The 'layered' engine answers with one search over (location, carpool mode) states instead,
+                                see layered_route().
+
+                              With a cache, see use_cache, the 'dijkstra' engine uses the full trees from start and end
+                                in the cache instead of searching.
+
+        Input:
+            start: an int, departure location.
+            end: an int, destination location.
+            passengers: a list locations where there are potential passengers.
+            engine: 'dijkstra', 'alt', 'ch', 'delta' or 'layered', the search used for both graphs. Default = 'dijkstra'
+        Return:
+            carpool_travel: The shortest path for travelling where it picked up a passenger.
+            alone_travel: The shortest path for travelling where it doesn't pick up passenger.
+        Time complexity:
+            Best: O(|P|), when start is end and no passenger is worth it.
+            Worst: O(|R|log|L|), for the two dijkstra, the graphs are not rebuilt.
+        Space complexity:
+            Aux: O(|L|), for the output path list, the search state of the graphs is reused.
+        """
+        alone = self.alone
+        stats = self.stats
+        if stats is not None:
+            stats.start()
+
+        if engine == 'layered':
+            travel = self.layered_route(start, end, passengers)     # O(|R|log|L|)
+            if stats is not None:
+                stats.lap('search_layered')
+
+        elif self.cache is not None and engine == 'dijkstra':
+            alone_tree = self.tree(False, start)        # O(|R|log|L|) on a miss
+            if stats is not None:
+                stats.lap('search_alone')
+            pickup_loc = None
+            if passengers:
+                carpool_tree = self.tree(True, end)     # O(|R|log|L|) on a miss
+                if stats is not None:
+                    stats.lap('search_carpool')
+                pickup_loc = self.passenger_pickup(passengers, end, alone_tree, carpool_tree)     # O(|P|)
+                if stats is not None:
+                    stats.lap('pickup')
+            if pickup_loc is not None:
+                travel = alone_tree.path(pickup_loc, False) + carpool_tree.path(pickup_loc, True)     # O(|L|)
+            else:
+                travel = alone_tree.path(end, False)    # O(|L|)
+            if stats is not None:
+                stats.lap('path')
+
+        elif not passengers and engine == 'dijkstra':
+            alone.bidirectional(start, end)     # O(|R|log|L|), Aux: O(1)
+            if stats is not None:
+                stats.lap('search_alone')
+            travel = alone.path(end, False)     # O(|L|), Aux: O(|L|)
+            if stats is not None:
+                stats.lap('path')
+
+        else:
+            # conducting the search from start until end and all the passengers are reached
+            self.search(False, start, [end] + list(passengers), inf, engine)     # O(|R|log|L|), Aux: O(|P|)
+            if stats is not None:
+                stats.lap('search_alone')
+            alone_time = alone.get_time(end)
+
+            # passengers that can be reached before we could have arrived at end alone
+            worth = [p for p in passengers if alone.get_time(p) < alone_time]      # O(|P|)
+            pickup_loc = None
+            if worth:
+                closest = min(alone.get_time(p) for p in worth)      # O(|P|)
+                self.search(True, end, worth, alone_time - closest, engine)     # O(|R|log|L|), Aux: O(|P|)
+                if stats is not None:
+                    stats.lap('search_carpool')
+                pickup_loc = self.passenger_pickup(worth, end)    # O(|P|)
+                if stats is not None:
+                    stats.lap('pickup')
+
+            if pickup_loc is not None:          # if it's worth picking up passenger
+                travel = alone.path(pickup_loc, False) + self.carpool.path(pickup_loc, True)     # O(|L| + |L|), Aux: O(|L|)
+            else:                               # if it's not worth picking up passenger
+                travel = alone.path(end, False)         # O(|L|), Aux: O(|L|)
+            if stats is not None:
+                stats.lap('path')
+
+        if stats is not None:
+            stats.finish()
+        return travel
+
+
+class RouteService:
+    """
+    This is a class for answering route queries from asyncio code, for a server that gets many queries at once on the
+    roads of one RoutePlanner.
+
+    Every query needs the search from its start on the alone graph and the reversed search from its end on the carpool
+    graph. The service runs each of them as a full dijkstra, so the result serves every query with the same start or
+    end, and keeps the searches that are still running in in_flight. A query whose start or end is already being
+    searched waits for that search instead of starting another, so a burst of queries to the same destination costs one
+    carpool search. If the planner has a cache, see RoutePlanner.use_cache, finished searches are also kept there.
+
+    The searches run in a worker pool so they never block the event loop. Without workers, a single thread searches the
+    graphs of the planner, which must not be used by anything else meanwhile. With workers, a process pool searches
+    copies of the graphs built on shared memory, see matrix_worker_init, and the finished ShortestPathTree is sent back.
+    The copies are made again with a new pool once RoutePlanner.update_road changes the graphs, see share.
+
+    Author: Lim Jun Yi
+    student_id: 32625510
+    Date: 2023/4/24
+    """
+
+    def __init__(self, planner, workers=None):
+        """
+        This is the initialisation method for the RouteService class.
+
+        Input:
+            planner: the RoutePlanner of the roads.
+            workers: an int, the number of worker processes. Default = None, one thread.
+        Time complexity:
+            best/worst: O(|R| + |L|) with workers, to copy the roads to shared memory, O(1) otherwise.
+        Space complexity:
+            Aux: O(|R| + |L|) of shared memory with workers.
+        """
+        self.planner = planner
+        self.in_flight = {}         # (carpool, source, version) -> future of the running search
+        self.searches = 0           # searches started, lower than twice the queries when queries were coalesced
+        self.queries = 0
+        self.shm = None
+        self.workers = workers
+        self.versions = None        # versions of the alone and carpool graphs the workers have copies of
+        self.retired = []           # shared memory of older copies, freed by close
+        if workers:
+            self.executor = None
+            self.graphs = None
+            self.share()            # O(|R| + |L|)
+        else:
+            self.executor = ThreadPoolExecutor(1)
+            self.graphs = {False: planner.alone, True: planner.carpool}
+
+    def share(self):
+        """
+        This function copies the graphs of the planner to new shared memory and starts a new worker pool on it. The old
+        pool finishes the searches it was given on the old roads, its shared memory is kept until close, as its workers
+        may still be attaching to it.
+
+        Time complexity:
+            best/worst: O(|R| + |L|), to copy the roads.
+        Space complexity:
+            Aux: O(|R| + |L|) of shared memory.
+        """
+        alone = self.planner.alone
+        carpool = self.planner.carpool
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.retired.append(self.shm)
+        self.shm, layout = share_arrays([alone.offsets, alone.targets, alone.weights,
+                                         carpool.offsets, carpool.targets, carpool.weights])    # O(|R| + |L|)
+        self.executor = ProcessPoolExecutor(self.workers, initializer=matrix_worker_init,
+                                            initargs=(self.shm.name, layout, alone.queue_kind))
+        self.versions = (alone.version, carpool.version)
+
+    def tree(self, carpool, source):
+        """
+        This function returns a future of the search from source, starting it unless the same search is running.
+
+        Input:
+            carpool: a boolean value, True for the reversed carpool graph, False for the alone graph.
+            source: an int, the location to search from.
+        Return:
+            an asyncio future of the ShortestPathTree.
+        Time complexity:
+            best: O(1), the search runs in the pool.
+            worst: O(|R| + |L|), when the roads changed since the workers copied them, see share.
+        Space complexity:
+            Aux: O(1), O(|R| + |L|) of shared memory when the roads changed.
+        """
+        version = (self.planner.carpool if carpool else self.planner.alone).version
+        if self.workers and self.versions != (self.planner.alone.version, self.planner.carpool.version):
+            self.share()            # O(|R| + |L|), the workers would search the old roads
+        key = (carpool, source, version)        # also the cache key, searches on older roads are not joined
+        future = self.in_flight.get(key)
+        cache = self.planner.cache
+        if future is None and cache is not None:
+            tree = cache.get(key)
+            if tree is not None:                        # finished before, no search needed
+                future = asyncio.get_running_loop().create_future()
+                future.set_result(tree)
+                return future
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, tree_job, carpool, source, self.graphs)
+            if cache is not None:
+                def keep(finished):
+                    if not finished.cancelled() and finished.exception() is None:
+                        cache.put(key, finished.result())
+                future.add_done_callback(keep)
+            self.in_flight[key] = future
+            self.searches += 1
+
+            def done(finished):
+                if self.in_flight.get(key) is finished:
+                    del self.in_flight[key]
+            future.add_done_callback(done)
+        return future
+
+    async def route(self, start, end, passengers):
+        """
+        Function description: This function finds the fastest route between start and end, the same time as
+                                RoutePlanner.route, without blocking the event loop.
+
+        Approach description: The search from start and, if there are passengers, the search from end are started or
+                                joined at the same time, so with workers they run in parallel. The pickup is then chosen on
+                                the two trees with passenger_pickup.
+
+        Input:
+            start: an int, departure location.
+            end: an int, destination location.
+            passengers: a list locations where there are potential passengers.
+        Return:
+            the fastest path from start to end.
+        Time complexity:
+            best: O(|P| + |L|), when both searches were already running.
+            worst: O(|R|log|L|), for the two searches.
+        Space complexity:
+            Aux: O(|L|), for the trees and the path.
+        """
+        self.queries += 1
+        passengers = list(passengers)
+        alone_search = self.tree(False, start)
+        carpool_search = self.tree(True, end) if passengers else None
+        alone_tree = await alone_search
+        if carpool_search is None:
+            return alone_tree.path(end, False)
+        carpool_tree = await carpool_search
+
+        pickup_loc = self.planner.passenger_pickup(passengers, end, alone_tree, carpool_tree)   # O(|P|)
+        if pickup_loc is None:
+            return alone_tree.path(end, False)
+        return alone_tree.path(pickup_loc, False) + carpool_tree.path(pickup_loc, True)
+
+    async def numbered(self, number, query):
+        """
+        This function answers one query of stream and returns it with its number.
+        """
+        return number, await self.route(*query)
+
+    async def stream(self, queries):
+        """
+        This function answers many queries at once and gives back each answer as soon as it is ready, which may not be
+        in the order of the queries.
+
+        Input:
+            queries: an iterable of (start, end, passengers).
+        Return:
+            an async generator of (i, path), where path is the answer of the i-th query.
+        Time complexity:
+            see route, for each distinct start and end.
+        Space complexity:
+            Aux: O(Q + |L|), where Q is the number of queries.
+        """
+        tasks = [asyncio.ensure_future(self.numbered(i, query)) for i, query in enumerate(queries)]
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+
+    def close(self):
+        """
+        This function stops the worker pool and frees the shared memory.
+
+        Time complexity:
+            best/worst: O(1), after the running searches end.
+        Space complexity:
+            Aux: O(1)
+        """
+        self.executor.shutdown()
+        if self.shm is not None:
+            self.retired.append(self.shm)
+            self.shm = None
+        for shm in self.retired:
+            shm.close()
+            shm.unlink()
+        self.retired = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+
+def optimalRoute(start, end, passengers, roads, stats=None):
+    """
+    Function description: This function is used to find the fastest route between start and end. It achieved the goal
+                            by representing the roads in a graph form and uses dijkstra's algorithm to find the shortest time
+                            for each location form the start.
+
+    Approach description: The approach is to first make two graph representing travelling alone without using any carpool lane
+                            and make another graph for only travelling using carpool lane, which this graph is in reverse.
+                            Then followed by adding the roads for each location in the graph, which is done by the add_road_prep
+                            function in the Graph class. Both graphs are kept by a RoutePlanner, callers with many queries on
+                            the same roads should make one RoutePlanner and call its route method instead.
+                            Two dijkstra will run simultaneously to find the shortest time form source for each location in the graph,
+                            where for travelling alone it starts from 'start' to 'end'; and 'end' to 'start' for travelling with
+                            carpool.
+                            After the dijkstra has complete, a function called passenger_pickup will determine whether is it worth it
+                            to pick up any passenger alone the way by comparing the time from start for the destination location.
+                            If not worth it the function return the shortest path for travelling alone and vise versa.
+    Input:
+        start: an int, departure location.
+        end: an int, destination location.
+        passengers: a list locations where there are potential passengers.
+        roads: an iterable of roads with the corresponding travel times, read once, so it can be a generator.
+        stats: a RouteStats to collect counters and phase times in, see RouteStats. Default = None
+    Return:
+        carpool_travel: The shortest path for travelling where it picked up a passenger.
+        alone_travel: The shortest path for travelling where it doesn't pick up passenger.
+    Time complexity:
+        Best/Worst: O(|R|log|L|), as this is the most significant complexity in the function.
+                    where |R| is numbers of roads and |L| is the number of locations. Break down see individual function's doc above.
+    Space complexity:
+        The space complexity will be O(|L| + |P| + |R|), simplify to O(|L| + |R|), where |L| is the number of unique locations
+                in the 'roads' and |R| is the number of roads.
+        Aux: O(|L| + |R|), for the arrays of the two graphs and the output path list.
+
+    """
+    planner = RoutePlanner(roads, stats=stats)      # O(|R| + |L|)
+    return planner.route(start, end, passengers)    # O(|R|log|L|)
+
+
+def select_sections(occupancy_probability, k=1):
+    """
+    Function description: This function uses the dynamic programming to find the best place to store the HPC with the goal of using the minimum total space.
+                            It returns a list consist of an integer which is the total space occupy by the placement of HPC and a list of tuples represents the
+                            location of one section selected for removal. The section of each row must be within k columns of the section of the row above,
+                            k = 1 is the original rule of the three adjacent sections.
+
+    Approach description: The function will first find out the dimension of the given input(n*m), where n is the number of rows and m is the number of columns.
+                            After knowing the dimension, I built a memo which is a matrix of the same size n*m to stores all the tabulated values from the recurrence relation,
                             follow the recurrence relation, the function filled up all the space in memo. This is achieved by using the bottom-up approach of dynamic programming.
+
+                            The recurrence is memo[x][y] = occupancy_probability[x][y] + the minimum of memo[x+1][y-k .. y+k], cut at the ends of the row. Checking
+                            the 2k+1 cells for every cell would cost O(nmk), so the minimum of the window is kept with a monotonic deque instead: the deque holds
+                            the columns of the row below in increasing order whose value is smaller than every value after it, so the front is the minimum of the
+                            window. Moving the window one column to the right adds one column at the back (removing the larger values before it) and drops the
+                            front if it left the window, every column goes in and out once, so a row costs O(m) whatever k is.
+
                             To get the solution, I find the smallest value from the top of the memo(memo[0]) where it will contain the minimum total occupancy,
-                            to get the location of each space that is removed from each row, a top to down backtracking on the memo is being conducted. And the result is added
-                            to the selections_location list. The final result of minimum_total_occupancy and sections_location is being combined into a list and return as
-                            the solution of the function.
+                            to get the location of each space that is removed from each row, a top to down backtracking on the memo is being conducted, picking the
+                            leftmost smallest cell within k columns in each row. And the result is added to the selections_location list. The final result of
+                            minimum_total_occupancy and sections_location is being combined into a list and return as the solution of the function.
 
     Input:
         occupancy_probability: It is a list of list, where there are n amount of interior lists and within the interior list there are m amount of columns.
                                 Each interior list represented a different row of sections, where occupancy_probability[x][y] is an integer number of range 1 to 100(include) which
                                 represent how many percent of that space is being used.
+        k: an int, how many columns to the left or right the section of the next row may be. Default = 1
     Return:
         minimum_total_occupancy: an int showing the total occupancy that has been removed by the function.
         sections_location: a list of n amount of tuples(i,j), which indicate the location of the space that is being removed.
     Time complexity:
-        best/worst: O(nm), because O(n+2m+3nm) = O(nm) as nm is the most significant in the bound. Where n is the number of rows, and m is the number of columns.
+        best/worst: O(nm), every row is filled in O(m) with the deque and backtracked in O(k), k is at most m. Where n is the number of rows, and m is the number of columns.
     Space complexity:
         The space complexity is O(nm), where n is the number of rows, and m is the number of columns.
         Aux: O(nm), as we need to create a memo matrix of size n*m to do backtracking and storing of tabulation values.
     """
+    if k < 0:
+        raise ValueError("k must be at least 0")
     sections_location = []
 
     n = len(occupancy_probability)  # numbers of rows in occupancy_probability,     O(1) for time, O(1) for space
@@ -573,16 +3738,20 @@ def select_sections(occupancy_probability):
 
     # filling up the matrix with value, from the last row up
     for x in range(n-2, -1, -1):     # O(n)
-        for y in range(m):    # O(m)
-            # if y at the start of the row (conor), they can only choose to remove the space directly below or to the right
-            if y == 0:
-                memo[x][y] = min(memo[x+1][y], memo[x+1][y+1]) + occupancy_probability[x][y]     # O(1), only comparing two items
-            # if y at the end of the row (conor), they can only choose to remove the space directly below or to the left from the next row
-            elif y == m-1:
-                memo[x][y] = min(memo[x+1][y], memo[x+1][y-1]) + occupancy_probability[x][y]     # O(1), only comparing two items
-            # if y at any place in-between, they can choose to remove the space below, to the right or to the left from next row
-            else:
-                memo[x][y] = min(memo[x+1][y-1], memo[x+1][y], memo[x+1][y+1]) + occupancy_probability[x][y]    # O(1), only comparing three items
+        below = memo[x+1]
+        window = deque()    # columns of the row below, their values increasing from the front
+        j = 0               # next column of the row below to add to the window
+        for y in range(m):    # O(m) amortised, every column is added and removed once
+            # add the columns up to y + k at the back, removing the columns before them with a larger or equal value
+            while j < m and j <= y + k:
+                while window and below[window[-1]] >= below[j]:
+                    window.pop()
+                window.append(j)
+                j += 1
+            # the front left the window on the left
+            if window[0] < y - k:
+                window.popleft()
+            memo[x][y] = below[window[0]] + occupancy_probability[x][y]     # O(1), the minimum of the window
 
     minimum_total_occupancy = min(memo[0])  # O(m)
 
@@ -594,31 +3763,704 @@ def select_sections(occupancy_probability):
 
     # to backtracking and get back the answer
     for x in range(n):      # O(n)
-        # if the position of the item is at the start, it can only choose the one below or to the right
-        if start_pos == 0:
-            # find the minimum space for the two possible option a row below
-            min_space = min(memo[x][start_pos], memo[x][start_pos+1])
-            # find the index of that chosen space in the below row, slicing is used to prevent the returning of the index of the first similar item in the list.
-            start_pos = memo[x][start_pos:].index(min_space) + start_pos           # O(m + m) = O(m)
-            # add the chosen row(n) and column(m) into the result
-            sections_location.append((x, start_pos))    # O(1)
-
-        # if the position of the item is at the end, it can only choose the one below or to the left
-        elif start_pos == m-1:
-            # find the minimum space for the two possible option a row below
-            min_space = min(memo[x][start_pos], memo[x][start_pos-1])
-            # find the index of that chosen space in the below row, slicing is used to prevent the returning of the index of the first similar item in the list.
-            start_pos = memo[x][start_pos-1:].index(min_space) + start_pos - 1     # O(m + m) = O(m)
-            # add the chosen row(n) and column(m) into the result
-            sections_location.append((x, start_pos))    # O(1)
-
-        # else it can have three options adjacent to it.
-        else:
-            # find the minimum space for the three possible option a row below
-            min_space = min(memo[x][start_pos-1], memo[x][start_pos], memo[x][start_pos+1])
-            # find the index of that chosen space in the below row, slicing is used to prevent the returning of the index of the first similar item in the list.
-            start_pos = memo[x][start_pos-1:].index(min_space) + start_pos - 1     # O(m + m) = O(m)
-            # add the chosen row(n) and column(m) into the result
-            sections_location.append((x, start_pos))    # O(1)
+        # the choices are the sections at most k columns away from the one chosen in the row above, cut at the ends of the row
+        low = max(start_pos - k, 0)
+        choices = memo[x][low:start_pos + k + 1]       # O(k)
+        # take the leftmost of the smallest choices, index returns the first one
+        start_pos = choices.index(min(choices)) + low      # O(k)
+        # add the chosen row(n) and column(m) into the result
+        sections_location.append((x, start_pos))    # O(1)
 
     return [minimum_total_occupancy, sections_location]     # O(n)
+
+
+def select_sections_vectorised(occupancy_probability):
+    """
+    Function description: This function gives the same result as select_sections(), with every row of the memo filled by
+                            a few NumPy operations instead of a Python loop over its cells, for large grids.
+
+    Approach description: The recurrence of select_sections() takes, for every cell, the smallest of the up to three
+                            cells below it. For a whole row this is the element-wise minimum of the row below and the row
+                            below shifted one column to the left and to the right, where the shifted rows are one cell
+                            shorter, so the corner cells only see their two neighbours. The memo is a NumPy array of int32,
+                            4 bytes for each cell instead of a Python int, int64 is only used if the totals may not fit.
+
+                          The backtracking looks at the same window of up to three cells in each row as select_sections()
+                            and picks the same cell, the leftmost smallest one, starting from the last smallest total of the
+                            top row, so the sections are the same even when several choices are equally good.
+
+    Input:
+        occupancy_probability: a list of n lists of m ints, or an n x m NumPy array, see select_sections().
+    Return:
+        minimum_total_occupancy: an int showing the total occupancy that has been removed by the function.
+        sections_location: a list of n amount of tuples(i,j), which indicate the location of the space that is being removed.
+    Time complexity:
+        best/worst: O(nm), as O(n) NumPy operations over rows of m cells, and O(n) for the backtracking.
+    Space complexity:
+        Aux: O(nm), 4 bytes for each cell of the memo.
+    """
+    if np is None:
+        raise ImportError("select_sections_vectorised needs numpy")
+    grid = np.asarray(occupancy_probability)
+    n, m = grid.shape
+    dtype = np.int32 if int(grid.max()) * n < 2 ** 31 else np.int64
+    grid = grid.astype(dtype, copy=False)
+
+    memo = np.empty((n, m), dtype=dtype)        # O(nm)
+    memo[n-1] = grid[n-1]
+    best = np.empty(m, dtype=dtype)
+    for x in range(n-2, -1, -1):                # O(n) rows of O(m) NumPy work
+        below = memo[x+1]
+        best[:] = below
+        np.minimum(below[:-1], below[1:], out=best[:-1])     # the cell below and to the right
+        np.minimum(best[1:], below[:-1], out=best[1:])       # and the cell below and to the left
+        np.add(best, grid[x], out=memo[x])
+
+    return trace_sections(memo)
+
+
+def fill_rows(grid, memo, top, bottom, low, high):
+    """
+    Function description: This function fills the rows top to bottom - 1 of the memo of select_sections_vectorised() for
+                            the columns low to high - 1, from row bottom of the memo.
+
+    Approach description: Each row up only depends on the up to three cells below, so a block of k rows over some columns
+                            needs the row below over k more columns on each side, the halo. The rows are worked out over
+                            the columns with the halo, where the cells at a cut end of the halo only see two cells below
+                            and may be wrong. Each row up moves the wrong cells one column inwards, so after k rows they
+                            are still within the halo, and the columns low to high - 1 are exact. At the real ends of the
+                            grid only seeing two cells below is the rule itself.
+
+    Input:
+        grid: an n x m NumPy array of the occupancy.
+        memo: an n x m NumPy array, row bottom filled, rows top to bottom - 1 are written for the columns low to high - 1.
+        top, bottom: ints, the first row to fill and the row below the last row to fill.
+        low, high: ints, the columns to fill.
+    Time complexity:
+        best/worst: O(k(w + 2k)), where k = bottom - top and w = high - low.
+    Space complexity:
+        Aux: O(w + 2k)
+    """
+    halo = bottom - top
+    left = max(0, low - halo)
+    right = min(memo.shape[1], high + halo)
+    below = memo[bottom, left:right].copy()
+    best = np.empty_like(below)
+    for x in range(bottom - 1, top - 1, -1):
+        best[:] = below
+        np.minimum(below[:-1], below[1:], out=best[:-1])
+        np.minimum(best[1:], below[:-1], out=best[1:])
+        np.add(best, grid[x, left:right], out=below)
+        memo[x, low:high] = below[low - left:high - left]
+
+
+def trace_sections(memo):
+    """
+    This function backtracks a memo of select_sections_vectorised() from the top row, with the same choices as
+    select_sections(): the last smallest total of the top row, then the leftmost smallest of the up to three cells in
+    each row.
+
+    Input:
+        memo: an n x m NumPy array, memo[x][y] is the smallest total from cell (x, y) to the bottom row.
+    Return:
+        [minimum_total_occupancy, sections_location], see select_sections().
+    Time complexity:
+        best/worst: O(n + m)
+    Space complexity:
+        Aux: O(n), for the result.
+    """
+    n, m = memo.shape
+    top = memo[0]
+    minimum_total_occupancy = int(top.min())
+    start_pos = m - 1 - int(top[::-1].argmin())    # the last smallest total, as in select_sections()
+
+    sections_location = []
+    for x in range(n):      # O(n)
+        low = max(start_pos - 1, 0)
+        start_pos = low + int(memo[x, low:start_pos + 2].argmin())     # leftmost smallest of the up to three cells
+        sections_location.append((x, start_pos))
+    return [minimum_total_occupancy, sections_location]
+
+
+def sections_worker_init(name, n, m, dtype):
+    """
+    This function runs once in every worker process of select_sections_tiled(), it opens the shared grid and memo.
+
+    Time complexity:
+        best/worst: O(1)
+    Space complexity:
+        Aux: O(1), the arrays are shared.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    cells = np.ndarray((2, n, m), dtype=dtype, buffer=shm.buf)
+    worker_state['sections'] = (shm, cells[0], cells[1])
+
+
+def sections_tile(top, bottom, low, high):
+    """
+    This function fills one tile of the shared memo in a worker process of select_sections_tiled(), see fill_rows().
+    """
+    shm, grid, memo = worker_state['sections']
+    fill_rows(grid, memo, top, bottom, low, high)
+
+
+def select_sections_batch(grids, paths=False):
+    """
+    Function description: This function runs select_sections() on many grids of the same shape in one call, for example
+                            every candidate floor plan of a planning run.
+
+    Approach description: The grids are stacked into one (batch, n, m) NumPy array, and the memo is filled one row at a
+                            time for every grid at once, with the same shifted minimum as select_sections_vectorised() along
+                            the last axis. So the Python loop runs n times however many grids there are.
+
+                          Without paths only the minimum totals are needed, so only the current row of the memo of every
+                            grid is kept. With paths the whole memo is kept and backtracked for every grid at once: the
+                            up to three cells next to the column chosen in the row above are gathered for every grid,
+                            cells outside the grid count as infinite, and the leftmost smallest is chosen, starting from the
+                            last smallest total of the top row, the same choices as select_sections().
+
+    Input:
+        grids: a (batch, n, m) NumPy array, or a list of n x m grids, see select_sections().
+        paths: a boolean value, True to also return the sections. Default = False
+    Return:
+        minimums: a NumPy array of the minimum total occupancy of every grid.
+        columns: only with paths, a (batch, n) NumPy array, the sections of grid b are (x, columns[b][x]) for every row x.
+    Time complexity:
+        best/worst: O(bnm), as O(n) NumPy operations over b x m cells, where b is the number of grids.
+    Space complexity:
+        Aux: O(bm), or O(bnm) with paths for the memo.
+    """
+    if np is None:
+        raise ImportError("select_sections_batch needs numpy")
+    grids = np.asarray(grids)
+    batch, n, m = grids.shape
+    dtype = np.int32 if int(grids.max(initial=0)) * n < 2 ** 31 else np.int64
+    grids = grids.astype(dtype, copy=False)
+
+    memo = np.empty((batch, n, m) if paths else (batch, 1, m), dtype=dtype)
+    row = n - 1 if paths else 0
+    memo[:, row] = grids[:, n-1]
+    best = np.empty((batch, m), dtype=dtype)
+    for x in range(n-2, -1, -1):                # O(n) rows of O(bm) NumPy work
+        below = memo[:, row]
+        best[:] = below
+        np.minimum(below[:, :-1], below[:, 1:], out=best[:, :-1])
+        np.minimum(best[:, 1:], below[:, :-1], out=best[:, 1:])
+        if paths:
+            row = x
+        np.add(best, grids[:, x], out=memo[:, row])
+
+    top = memo[:, 0]
+    minimums = top.min(axis=1)
+    if not paths:
+        return minimums
+
+    everyone = np.arange(batch)
+    columns = np.empty((batch, n), dtype=np.int64)
+    start_pos = m - 1 - top[:, ::-1].argmin(axis=1)        # the last smallest total of every top row
+    outside = np.iinfo(dtype).max
+    for x in range(n):      # O(n)
+        choices = np.full((3, batch), outside, dtype=dtype)
+        for shift in (-1, 0, 1):
+            column = start_pos + shift
+            inside = (column >= 0) & (column < m)
+            choices[shift + 1, inside] = memo[everyone[inside], x, column[inside]]
+        start_pos = start_pos + choices.argmin(axis=0) - 1     # leftmost smallest of the up to three cells
+        columns[:, x] = start_pos
+    return minimums, columns
+
+
+class SectionSolver:
+    """
+    This is a class for keeping the answer of select_sections() up to date while a few cells of the grid change at a
+    time, without filling the whole memo again.
+
+    The memo is the one of select_sections_vectorised(), memo[x][y] is the smallest total from cell (x, y) to the bottom
+    row. A change to cell (x, y) can only change memo[x][y], and a change to the cells y1..y2 of a row can only change the
+    cells y1-1..y2+1 of the row above, so the cells to fill again form a cone above the changed cells that gets one
+    column wider on each side for every row up. Only those cells are filled again, and the cone is narrowed to the cells
+    whose value really changed, so it usually stops after a few rows.
+
+    Author: Lim Jun Yi
+    student_id: 32625510
+    Date: 2023/4/24
+    """
+
+    def __init__(self, occupancy_probability):
+        """
+        This is the initialisation method for the SectionSolver class. Fill the whole memo once.
+
+        Input:
+            occupancy_probability: a list of n lists of m ints, or an n x m NumPy array, see select_sections().
+        Time complexity:
+            best/worst: O(nm), see select_sections_vectorised().
+        Space complexity:
+            Aux: O(nm), for the grid and the memo.
+        """
+        if np is None:
+            raise ImportError("SectionSolver needs numpy")
+        self.grid = np.array(occupancy_probability, dtype=np.int64)      # a copy, changed by update
+        self.n, self.m = self.grid.shape
+        self.memo = np.empty((self.n, self.m), dtype=np.int64)
+        self.memo[self.n-1] = self.grid[self.n-1]
+        fill_rows(self.grid, self.memo, 0, self.n - 1, 0, self.m)       # O(nm)
+        self.refilled = 0           # cells filled again by update, to see how much work the updates took
+
+    def update(self, cells):
+        """
+        Function description: This function changes some cells of the grid and returns the new answer.
+
+        Approach description: The rows are gone through from the lowest changed row upwards. The cells to fill again in a
+                                row are the cells changed in the row itself together with the cells above the cells whose memo
+                                value changed in the row below, widened by one column on each side, as one range of columns.
+                                Once no memo value changed in a row and no changed cell is above it, the rows further up
+                                can not change and the update stops.
+
+        Input:
+            cells: an iterable of (x, y, value), the new occupancy of cell (x, y).
+        Return:
+            [minimum_total_occupancy, sections_location], the same as select_sections() on the changed grid.
+        Time complexity:
+            best: O(n + c), where c is the number of changed cells, when no memo value changes.
+            worst: O(nm), when the cone reaches the top row over every column.
+        Space complexity:
+            Aux: O(m + n), for a row of the cone and the result.
+        """
+        grid = self.grid
+        memo = self.memo
+        m = self.m
+        dirty = {}                  # row -> (lowest, highest) changed column
+        for x, y, value in cells:
+            grid[x, y] = value
+            low, high = dirty.get(x, (y, y))
+            dirty[x] = (min(low, y), max(high, y))
+        if not dirty:
+            return self.solve()
+
+        last = min(dirty)           # the highest row with a changed cell
+        carry = None                # (lowest, highest) column whose memo changed in the row below
+        for x in range(max(dirty), -1, -1):
+            span = dirty.get(x)
+            if carry is not None:
+                low, high = max(carry[0] - 1, 0), min(carry[1] + 1, m - 1)
+                span = (low, high) if span is None else (min(span[0], low), max(span[1], high))
+            if span is None:
+                if x < last:
+                    break
+                continue
+            low, high = span
+            if x == self.n - 1:
+                values = grid[x, low:high + 1]
+            else:
+                left = max(low - 1, 0)
+                below = memo[x + 1, left:min(high + 2, m)]
+                best = below.copy()
+                np.minimum(below[:-1], below[1:], out=best[:-1])
+                np.minimum(best[1:], below[:-1], out=best[1:])
+                values = best[low - left:high - left + 1] + grid[x, low:high + 1]
+            changed = np.flatnonzero(values != memo[x, low:high + 1])
+            memo[x, low:high + 1] = values
+            self.refilled += high - low + 1
+            carry = (low + int(changed[0]), low + int(changed[-1])) if len(changed) else None
+            if carry is None and x <= last:
+                break
+        return self.solve()
+
+    def solve(self):
+        """
+        This function returns the answer for the current grid from the memo, see trace_sections().
+
+        Return:
+            [minimum_total_occupancy, sections_location], the same as select_sections().
+        Time complexity:
+            best/worst: O(n + m)
+        Space complexity:
+            Aux: O(n)
+        """
+        return trace_sections(self.memo)
+
+
+def select_sections_tiled(occupancy_probability, workers=None, band=64):
+    """
+    Function description: This function gives the same result as select_sections() using several processes, for very
+                            wide grids.
+
+    Approach description: The memo is filled from the bottom in bands of band rows. Within a band the columns are split
+                            into one tile for each worker, and every tile is filled by its own process with a halo of band
+                            columns on each side, see fill_rows(), so the tiles of a band do not depend on each other. The
+                            next band starts once every tile of the band is done. The grid and the memo live in one block of
+                            shared memory, so the processes read and write them without copies.
+
+                          The memo is exactly the one of select_sections_vectorised(), and it is backtracked the same way,
+                            see trace_sections(), so the minimum total and the section locations are the same as the
+                            serial functions, ties included.
+
+    Input:
+        occupancy_probability: a list of n lists of m ints, or an n x m NumPy array, see select_sections().
+        workers: an int, the number of processes. Default = None, one for each CPU.
+        band: an int, the number of rows of a band, also the halo width. Default = 64
+    Return:
+        minimum_total_occupancy: an int showing the total occupancy that has been removed by the function.
+        sections_location: a list of n amount of tuples(i,j), which indicate the location of the space that is being removed.
+    Time complexity:
+        best/worst: O(nm / p + n * band), where p is the number of workers, the halo adds 2 * band columns to each tile.
+    Space complexity:
+        Aux: O(nm), for the shared grid and memo.
+    """
+    if np is None:
+        raise ImportError("select_sections_tiled needs numpy")
+    grid = np.asarray(occupancy_probability)
+    n, m = grid.shape
+    dtype = np.int32 if int(grid.max()) * n < 2 ** 31 else np.int64
+    workers = workers or os.cpu_count() or 1
+    tiles = min(workers, m)
+    bounds = [m * i // tiles for i in range(tiles + 1)]
+
+    shm = shared_memory.SharedMemory(create=True, size=2 * n * m * np.dtype(dtype).itemsize)
+    try:
+        cells = np.ndarray((2, n, m), dtype=dtype, buffer=shm.buf)
+        cells[0] = grid
+        cells[1, n-1] = grid[n-1]
+        with ProcessPoolExecutor(workers, initializer=sections_worker_init,
+                                 initargs=(shm.name, n, m, dtype)) as pool:
+            bottom = n - 1
+            while bottom > 0:       # O(n / band) bands
+                top = max(0, bottom - band)
+                jobs = [pool.submit(sections_tile, top, bottom, bounds[i], bounds[i + 1]) for i in range(tiles)]
+                for job in jobs:
+                    job.result()
+                bottom = top
+        result = trace_sections(cells[1])
+        del cells
+    finally:
+        shm.close()
+        shm.unlink()
+    return result
+
+
+def select_sections_streaming(rows, spill=None):
+    """
+    Function description: This function finds a selection of sections with the minimum total occupancy like
+                            select_sections(), reading the grid one row at a time, for grids that do not fit in memory.
+
+    Approach description: The recurrence is run from the top row down instead of from the bottom up, so the rows can come
+                            from an iterator in the order they are stored: best[y] is the smallest total of a selection
+                            from row 0 down to the current row that ends at column y, which is the occupancy of the cell plus
+                            the smallest best of the up to three cells above it. Only the best of the previous row and the
+                            current row are kept.
+
+                          For backtracking, every cell records which of the cells above it was the smallest (left, above
+                            or right, the leftmost on ties) in 2 bits, four cells to a byte, a quarter of a byte for each
+                            cell instead of a whole memo row of ints. The record grows in a bytearray, or with spill it is
+                            written to a file as it is made, so only O(m) stays in memory. The selection is then rebuilt
+                            from the last smallest total of the bottom row by following the 2 bit directions upwards, one
+                            lookup for each row, without scanning any row again.
+
+                          The minimum total is the same as select_sections(). When several selections have that total, the
+                            selection may be a different one of them, since the recurrence runs in the other direction.
+
+    Input:
+        rows: an iterable of the rows of the grid from the top, each a list or NumPy array of m ints, for example a
+                generator reading a file or a NumPy memmap of shape (n, m).
+        spill: a path of a file to keep the directions in instead of memory. Default = None
+    Return:
+        minimum_total_occupancy: an int showing the total occupancy that has been removed by the function.
+        sections_location: a list of n amount of tuples(i,j), which indicate the location of the space that is being removed.
+    Time complexity:
+        best/worst: O(nm), as O(n) NumPy operations over rows of m cells, and O(n) for the backtracking.
+    Space complexity:
+        Aux: O(m + nm/4) bytes, O(m) with spill, plus the n tuples of the result.
+    """
+    if np is None:
+        raise ImportError("select_sections_streaming needs numpy")
+    rows = iter(rows)
+    best = np.array(next(rows), dtype=np.int64)
+    m = len(best)
+    row_bytes = (m + 3) // 4                    # 4 directions of 2 bits in a byte
+    padded = np.zeros(row_bytes * 4, dtype=np.uint8)
+    above = np.empty((3, m), dtype=np.int64)
+    record = open(spill, 'wb+') if spill is not None else bytearray()
+    n = 1
+
+    try:
+        for row in rows:        # O(n)
+            above[0, 0] = above[2, m-1] = np.iinfo(np.int64).max     # no cell above and to the left/right of a corner
+            above[0, 1:] = best[:-1]
+            above[1] = best
+            above[2, :-1] = best[1:]
+            direction = above.argmin(axis=0)                            # 0 left, 1 above, 2 right, leftmost on ties
+            best = np.asarray(row, dtype=np.int64) + above[direction, np.arange(m)]
+            padded[:m] = direction
+            packed = padded[0::4] | (padded[1::4] << 2) | (padded[2::4] << 4) | (padded[3::4] << 6)
+            if spill is not None:
+                record.write(packed.tobytes())
+            else:
+                record += packed.tobytes()
+            n += 1
+
+        if spill is not None:
+            record.flush()
+            directions = mmap(record.fileno(), 0, access=ACCESS_READ) if n > 1 else b''
+        else:
+            directions = record
+
+        minimum_total_occupancy = int(best.min())
+        start_pos = m - 1 - int(best[::-1].argmin())    # the last smallest total of the bottom row
+
+        sections_location = [None] * n
+        for x in range(n - 1, -1, -1):      # O(n)
+            sections_location[x] = (x, start_pos)
+            if x > 0:       # the directions of row x are the (x-1)-th record
+                byte = directions[(x - 1) * row_bytes + start_pos // 4]
+                start_pos += ((byte >> (2 * (start_pos % 4))) & 3) - 1
+        if spill is not None and n > 1:
+            directions.close()
+    finally:
+        if spill is not None:
+            record.close()
+    return [minimum_total_occupancy, sections_location]
+
+
+def grid_roads(side, seed):
+    """
+    This function generates the roads of a side x side grid of locations, like the streets of a city. Every location has
+    a road to each of its up to four neighbours in both directions, with a random alone time from 1 to 100 and a carpool
+    time no longer than it.
+
+    Input:
+        side: an int, the number of locations along each side.
+        seed: the seed of the random times, the same seed gives the same roads.
+    Return:
+        a generator of roads (a, b, c, d), 4 * side * (side - 1) roads over side^2 locations.
+    Time complexity:
+        best/worst: O(side^2)
+    Space complexity:
+        Aux: O(1), the roads are generated one at a time.
+    """
+    rng = Random(seed)
+    for row in range(side):
+        for col in range(side):
+            v = row * side + col
+            for u in (v + 1 if col + 1 < side else -1, v + side if row + 1 < side else -1):
+                if u != -1:
+                    for a, b in ((v, u), (u, v)):
+                        c = rng.randint(1, 100)
+                        yield a, b, c, rng.randint(1, c)
+
+
+def geometric_roads(amount_locations, degree, seed):
+    """
+    This function generates a random geometric road network. The locations are random points in the unit square, and
+    two locations closer than a radius get a road in both directions, with the alone time growing with the distance.
+    The radius is chosen so a location has about degree neighbours. Close pairs are found with a grid of cells as wide
+    as the radius, so only the neighbouring cells of a location are checked.
+
+    Input:
+        amount_locations: an int, the number of locations.
+        degree: the average number of roads leaving a location.
+        seed: the seed of the points and times.
+    Return:
+        a generator of roads (a, b, c, d), about amount_locations * degree roads.
+    Time complexity:
+        best/worst: O(|L| * degree), expected.
+    Space complexity:
+        Aux: O(|L|), for the points and the cells.
+    """
+    rng = Random(seed)
+    radius = sqrt(degree / (pi * amount_locations))
+    width = max(1, int(1 / radius))             # cells along each side
+    xs = array('d', (rng.random() for _ in range(amount_locations)))
+    ys = array('d', (rng.random() for _ in range(amount_locations)))
+    cells = {}
+    for v in range(amount_locations):
+        cells.setdefault((int(xs[v] * width), int(ys[v] * width)), []).append(v)
+
+    for v in range(amount_locations):
+        cx = int(xs[v] * width)
+        cy = int(ys[v] * width)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for u in cells.get((cx + dx, cy + dy), ()):
+                    if u > v:
+                        distance = sqrt((xs[u] - xs[v]) ** 2 + (ys[u] - ys[v]) ** 2)
+                        if distance <= radius:
+                            c = max(1, round(distance / radius * 100))
+                            yield v, u, c, rng.randint(1, c)
+                            yield u, v, c, rng.randint(1, c)
+
+
+def scale_free_roads(amount_locations, links, seed):
+    """
+    This function generates a scale-free road network by preferential attachment (Barabasi-Albert). Every new location
+    gets roads in both directions to links earlier locations, chosen with a chance proportional to the number of roads
+    they already have, so a few hubs end up with most of the roads.
+
+    Input:
+        amount_locations: an int, the number of locations.
+        links: an int, the number of earlier locations each new location is joined to.
+        seed: the seed of the choices and times.
+    Return:
+        a generator of roads (a, b, c, d), about 2 * links * amount_locations roads.
+    Time complexity:
+        best/worst: O(|L| * links), expected.
+    Space complexity:
+        Aux: O(|L| * links), for the list of road ends the choices are made from.
+    """
+    rng = Random(seed)
+    ends = array('i')       # every location once for each road it has
+    for v in range(1, amount_locations):
+        chosen = set()
+        while len(chosen) < min(links, v):
+            chosen.add(ends[rng.randrange(len(ends))] if ends else 0)
+        for u in chosen:
+            c = rng.randint(1, 100)
+            yield v, u, c, rng.randint(1, c)
+            c = rng.randint(1, 100)
+            yield u, v, c, rng.randint(1, c)
+            ends.append(u)
+            ends.append(v)
+
+
+def road_network(kind, edges, seed):
+    """
+    This function picks the size of a generated road network of the given kind so it has about edges roads.
+
+    Input:
+        kind: 'grid', 'geometric' or 'scale_free'.
+        edges: an int, the wanted number of roads.
+        seed: the seed of the network.
+    Return:
+        amount_locations: an int, the number of locations.
+        roads: a generator of the roads, see grid_roads, geometric_roads and scale_free_roads.
+    Time complexity:
+        best/worst: O(1), the roads are generated when the generator is used.
+    Space complexity:
+        Aux: O(1)
+    """
+    if kind == 'grid':
+        side = max(2, round(sqrt(edges / 4)) + 1)
+        return side * side, grid_roads(side, seed)
+    if kind == 'geometric':
+        amount = max(2, edges // 8)
+        return amount, geometric_roads(amount, 8, seed)
+    if kind == 'scale_free':
+        amount = max(2, edges // 8)
+        return amount, scale_free_roads(amount, 4, seed)
+    raise ValueError("unknown road network kind: " + repr(kind))
+
+
+def percentile(ordered, fraction):
+    """
+    This function returns the nearest rank percentile of a sorted list, fraction = 0.5 for the median.
+
+    Time complexity:
+        best/worst: O(1)
+    Space complexity:
+        Aux: O(1)
+    """
+    if not ordered:
+        return None
+    return ordered[max(0, min(len(ordered) - 1, ceil(fraction * len(ordered)) - 1))]
+
+
+def benchmark(kind, edges, passengers=4, queries=100, seed=0, engine='dijkstra', queue='heap', memory=True):
+    """
+    Function description: This function measures how fast optimalRoute and MinHeap are on a generated road network, and
+                            returns the numbers as a dict that can be written as JSON and compared between runs.
+
+    Approach description: optimalRoute is a RoutePlanner build followed by one route call, so the two are timed apart:
+                            the build once, then queries random route calls with the same seed every run, each with
+                            passengers random passenger locations. The route latencies give the throughput and the median
+                            and 99th percentile, and build + route latency is the latency of optimalRoute.
+
+                          The peak memory of building the planner and answering one query is measured in a separate run
+                            with tracemalloc, which slows Python down too much to be on while timing.
+
+                          The MinHeap is timed on its own with |L| random adds, |L| / 2 updates and |L| serves.
+
+    Input:
+        kind: 'grid', 'geometric' or 'scale_free', see road_network.
+        edges: an int, about how many roads the network has.
+        passengers: an int, the number of passenger locations of each query. Default = 4
+        queries: an int, the number of route calls timed. Default = 100
+        seed: the seed of the network and the queries. Default = 0
+        engine: the engine of route. Default = 'dijkstra'
+        queue: the queue of the planner, see Graph.set_queue. Default = 'heap'
+        memory: a boolean value, False to skip the peak memory run. Default = True
+    Return:
+        result: a dict of the settings and measurements, times in seconds and memory in bytes. The locations are the ones
+                the planner has, up to the highest location with a road, which can be fewer than road_network asked for.
+    Time complexity:
+        best/worst: O(|R| + |L| + Q|R|log|L|), where Q is the number of queries.
+    Space complexity:
+        Aux: O(|R| + |L|), for the planner.
+    """
+    roads = road_network(kind, edges, seed)[1]
+    began = perf_counter()
+    planner = RoutePlanner(roads, queue)
+    build = perf_counter() - began
+    amount = planner.alone.amount_locations     # the top locations of a network may have no roads, and are not in it
+    if amount == 0:
+        raise ValueError("the " + kind + " network made for " + str(edges) + " roads has none, ask for more roads")
+    if engine == 'alt':
+        planner.prepare_landmarks()
+    elif engine == 'ch':
+        planner.prepare_hierarchies()
+
+    rng = Random(seed)
+    latencies = []
+    for _ in range(queries):
+        start = rng.randrange(amount)
+        end = rng.randrange(amount)
+        chosen = [rng.randrange(amount) for _ in range(passengers)]
+        began = perf_counter()
+        planner.route(start, end, chosen, engine)
+        latencies.append(perf_counter() - began)
+    total = sum(latencies)
+    latencies.sort()
+
+    result = {'kind': kind, 'locations': amount, 'roads': len(planner.alone.targets), 'passengers': passengers,
+              'queries': queries, 'seed': seed, 'engine': engine, 'queue': queue,
+              'python': sys.version.split()[0],
+              'build_seconds': build,
+              'route_p50_seconds': percentile(latencies, 0.5),
+              'route_p99_seconds': percentile(latencies, 0.99),
+              'route_per_second': queries / total if total > 0 else None,
+              'optimal_route_p50_seconds': build + percentile(latencies, 0.5) if latencies else None,
+              'optimal_route_p99_seconds': build + percentile(latencies, 0.99) if latencies else None}
+    del planner
+
+    rng = Random(seed)
+    heap = MinHeap(amount)
+    keys = [rng.random() for _ in range(amount)]
+    began = perf_counter()
+    for v in range(amount):
+        heap.add(v, keys[v])
+    for v in range(0, amount, 2):
+        heap.update(v, keys[v] / 2)
+    while heap.length > 0:
+        heap.serve()
+    result['heap_ops_per_second'] = (2 * amount + (amount + 1) // 2) / (perf_counter() - began)
+
+    if memory:
+        roads = road_network(kind, edges, seed)[1]
+        tracemalloc.start()
+        planner = RoutePlanner(roads, queue)
+        planner.route(0, amount - 1, list(range(min(passengers, amount))))
+        result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+if __name__ == '__main__':
+    # python "Optimal route and Dynamic programming.py" [kind] [edges] [passengers] [queries] [output.json]
+    arguments = sys.argv[1:]
+    result = benchmark(arguments[0] if len(arguments) > 0 else 'grid',
+                       int(float(arguments[1])) if len(arguments) > 1 else 10 ** 4,
+                       int(arguments[2]) if len(arguments) > 2 else 4,
+                       int(arguments[3]) if len(arguments) > 3 else 100)
+    if len(arguments) > 4:
+        with open(arguments[4], 'w') as f:
+            json.dump(result, f, indent=2)
+    else:
+        print(json.dumps(result, indent=2))